@@ -0,0 +1,327 @@
+"""Benchmarks for the Group 13 scheduler in scheduler-gpt.py.
+
+Usage:
+  python finalresult/benchmark.py memory [--processes N]
+  python finalresult/benchmark.py parser [--processes N]
+  python finalresult/benchmark.py schedulers [--processes N ...] [--runfor-scale S ...] [--quanta Q ...] [--json FILE]
+  python finalresult/benchmark.py hrrn [--processes N ...] [--load L] [--arrivals poisson|storm]
+
+`schedulers` times every algorithm over a grid of workload sizes, run lengths
+(as multiples of the workload's makespan) and RR quanta, and records wall time,
+events per second and tracemalloc peak memory. `--json` writes the results with
+the commit and interpreter they came from, so runs can be compared across commits.
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import tracemalloc
+from array import array
+from datetime import datetime, timezone
+from time import perf_counter
+
+from workload_gen import arrival_times, burst_times, write_workload
+
+
+def load_scheduler():
+    """Import scheduler-gpt.py, whose file name is not a valid module name."""
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scheduler-gpt.py')
+    spec = importlib.util.spec_from_file_location('scheduler_gpt', path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module  # So that checkpoints can pickle its classes
+    spec.loader.exec_module(module)
+    return module
+
+
+class DictProcess:
+    """The one-object-per-process layout the schedulers used before ProcessTable."""
+
+    def __init__(self, name, arrival_time, burst_time):
+        self.name = name
+        self.arrival_time = arrival_time
+        self.burst_time = burst_time
+        self.remaining_time = burst_time
+        self.wait_time = 0
+        self.turnaround_time = 0
+        self.response_time = -1
+        self.completed = False
+        self.appended = False
+
+
+class CountingTimeline:
+    """Timeline sink that only counts the events a scheduler reports."""
+
+    def __init__(self):
+        self.events = 0
+
+    def arrived(self, time, process):
+        self.events += 1
+
+    def selected(self, time, process, burst, cpu=None):
+        self.events += 1
+
+    def finished(self, time, process, cpu=None):
+        self.events += 1
+
+    def idle(self, start, end):
+        self.events += 1
+
+    def flush(self):
+        pass
+
+
+def naive_hrrn(scheduler):
+    """HRRN policy that scans every waiting process at each selection, the baseline for KineticTournament."""
+
+    class NaiveHighestResponseRatioNext(scheduler.SchedulingPolicy):
+        def __init__(self, processes, quantum=None, options=None):
+            super().__init__(processes, quantum, options)
+            self.ready = []  # In arrival order, so the first of equal ratios wins
+
+        def admit(self, process):
+            self.ready.append(process)
+
+        def pick_next(self, time):
+            if not self.ready:
+                return None
+            arrival, burst = self.processes.arrival, self.processes.burst
+            best = 0
+            for position, process in enumerate(self.ready):
+                top = self.ready[best]
+                if (time - arrival[process]) * burst[top] > (time - arrival[top]) * burst[process]:
+                    best = position
+            return self.ready.pop(best)
+
+    return NaiveHighestResponseRatioNext
+
+
+def synthetic_workload(count, seed=1, bursts='exponential', rate=0.1, arrivals='poisson'):
+    """Names, arrivals and bursts of a seeded workload (Poisson arrivals by default), plus its makespan."""
+    rng = random.Random(seed)
+    names = [f"P{i}" for i in range(count)]
+    arrivals = array('q', arrival_times(rng, count, arrivals, rate))
+    bursts = array('q', burst_times(rng, count, bursts))
+    makespan = 0
+    for arrival, burst in zip(arrivals, bursts):
+        makespan = max(makespan, arrival) + burst
+    return names, arrivals, bursts, makespan
+
+
+def traced_size(build):
+    """Bytes still allocated by the object `build()` returns."""
+    tracemalloc.start()
+    try:
+        result = build()
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return size
+
+
+def bench_memory(scheduler, count):
+    """Memory of a `count`-process workload in each process layout.
+
+    Both layouts share the same name strings, so those are left out of the totals.
+    """
+    names, arrivals, bursts, _ = synthetic_workload(count)
+    layouts = {
+        'ProcessTable': lambda: scheduler.ProcessTable(names, array('q', arrivals), array('q', bursts)),
+        'Process objects': lambda: [DictProcess(n, a, b) for n, a, b in zip(names, arrivals, bursts)],
+    }
+    return [(layout, traced_size(build)) for layout, build in layouts.items()]
+
+
+def bench_parser(scheduler, count, repeat=3):
+    """Best load time of a generated `count`-process file with each parser, and with the .inb cache."""
+    parsers = {
+        'parse_input_lines': scheduler.parse_input_lines,
+        'parse_input_file': scheduler.parse_input_file,
+        'cached .inb': scheduler.load_workload,
+    }
+    with tempfile.TemporaryDirectory() as scratch:
+        path = os.path.join(scratch, 'workload.in')
+        write_workload(path, count, use='rr', quantum=4)
+        size = os.path.getsize(path)
+        scheduler.load_workload(path)  # Compile the cache up front
+
+        rows = []
+        tables = []
+        for name, parse in parsers.items():
+            best = float('inf')
+            for _ in range(repeat):
+                start = perf_counter()
+                *_, processes = parse(path)
+                best = min(best, perf_counter() - start)
+            tables.append(processes)
+            rows.append((name, best, size))
+
+    first = tables[0]
+    for other in tables[1:]:
+        if (first.names, first.arrival, first.burst) != (other.names, other.arrival, other.burst):
+            raise AssertionError("the parsers disagree")
+    return rows
+
+
+def time_run(scheduler, algorithm, processes, run_for, quantum, repeat):
+    """Best wall time over `repeat` runs, and the number of events one run reports."""
+    best = float('inf')
+    for _ in range(repeat):
+        processes.reset()
+        timeline = CountingTimeline()
+        start = perf_counter()
+        scheduler.run_scheduler(algorithm, processes, run_for, quantum, timeline)
+        best = min(best, perf_counter() - start)
+    return best, timeline.events
+
+
+def peak_memory(scheduler, algorithm, processes, run_for, quantum):
+    """tracemalloc peak, in bytes, of one run on an already built process table."""
+    processes.reset()
+    tracemalloc.start()
+    try:
+        scheduler.run_scheduler(algorithm, processes, run_for, quantum, CountingTimeline())
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def bench_schedulers(scheduler, counts, runfor_scales, quanta, algorithms, repeat=3, memory=True, seed=1):
+    """One result record per point of the benchmark grid."""
+    results = []
+    for count in counts:
+        names, arrivals, bursts, makespan = synthetic_workload(count, seed)
+        processes = scheduler.ProcessTable(names, arrivals, bursts)
+        for scale in runfor_scales:
+            run_for = max(1, int(makespan * scale))
+            for algorithm in algorithms:
+                # Sweep the quanta for the algorithms that cannot run without one
+                needs_quantum = scheduler.SCHEDULERS[algorithm].check_parameters(None, {}) is not None
+                for quantum in (quanta if needs_quantum else [None]):
+                    seconds, events = time_run(scheduler, algorithm, processes, run_for, quantum, repeat)
+                    results.append({
+                        'algorithm': algorithm,
+                        'processes': count,
+                        'runfor': run_for,
+                        'runfor_scale': scale,
+                        'quantum': quantum,
+                        'seconds': seconds,
+                        'events': events,
+                        'events_per_second': events / seconds if seconds else None,
+                        'peak_bytes': peak_memory(scheduler, algorithm, processes, run_for, quantum) if memory else None,
+                    })
+    return results
+
+
+def bench_hrrn(scheduler, counts, load=2.0, arrivals='poisson', repeat=1, seed=1):
+    """(processes, kinetic seconds, naive seconds) for HRRN on workloads offered `load` times
+    the work the CPU can do; both must schedule identically.
+
+    The scan wins while the ready queue stays a handful of processes long; the
+    tree wins once it grows, which overload (`load` > 1) or storm arrivals cause.
+    """
+    results = []
+    policies = (scheduler.HighestResponseRatioNext, naive_hrrn(scheduler))
+    for count in counts:
+        names, arrival, bursts, makespan = synthetic_workload(count, seed, rate=load / 10, arrivals=arrivals)
+        processes = scheduler.ProcessTable(names, arrival, bursts)
+        times, outcomes = [], []
+        for policy in policies:
+            best = float('inf')
+            for _ in range(repeat):
+                processes.reset()
+                start = perf_counter()
+                scheduler.simulate(policy(processes), makespan, CountingTimeline())
+                best = min(best, perf_counter() - start)
+            times.append(best)
+            outcomes.append((processes.wait.tobytes(), processes.response.tobytes()))
+        if outcomes[0] != outcomes[1]:
+            raise AssertionError("the kinetic tournament and the scan picked differently")
+        results.append((count, *times))
+    return results
+
+
+def environment():
+    """Where a set of results came from."""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        'commit': commit,
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    subparsers = parser.add_subparsers(dest='suite', required=True)
+    memory = subparsers.add_parser('memory', help='memory footprint of the process table')
+    memory.add_argument('--processes', type=int, default=1_000_000)
+    parse = subparsers.add_parser('parser', help='line-by-line parser against the bulk parser and the .inb cache')
+    parse.add_argument('--processes', type=int, default=1_000_000)
+    parse.add_argument('--repeat', type=int, default=3)
+    schedulers = subparsers.add_parser('schedulers', help='throughput and memory of each algorithm over a grid')
+    schedulers.add_argument('--processes', type=int, nargs='+', default=[1_000, 10_000, 100_000])
+    schedulers.add_argument('--runfor-scale', type=float, nargs='+', default=[0.5, 1.0, 2.0],
+                            help="runfor values as multiples of the workload's makespan")
+    schedulers.add_argument('--quanta', type=int, nargs='+', default=[1, 4, 16],
+                            help="quanta to try (the base quantum for MLFQ)")
+    schedulers.add_argument('--algorithms', nargs='+', help="registered algorithms to run (default: all of them)")
+    schedulers.add_argument('--repeat', type=int, default=3, help="timed runs per point (the best is kept)")
+    schedulers.add_argument('--no-memory', action='store_true', help="skip the tracemalloc run")
+    schedulers.add_argument('--seed', type=int, default=1)
+    schedulers.add_argument('--json', help="write the results to this JSON file")
+    hrrn = subparsers.add_parser('hrrn', help='HRRN selection: kinetic tournament tree against a linear scan')
+    hrrn.add_argument('--processes', type=int, nargs='+', default=[1_000, 4_000, 16_000])
+    hrrn.add_argument('--load', type=float, default=2.0, help="offered work as a multiple of CPU capacity")
+    hrrn.add_argument('--arrivals', choices=('poisson', 'storm'), default='poisson')
+    hrrn.add_argument('--repeat', type=int, default=1)
+    args = parser.parse_args()
+
+    scheduler = load_scheduler()
+    if args.suite == 'memory':
+        print(f"{args.processes} processes")
+        for layout, size in bench_memory(scheduler, args.processes):
+            print(f"{layout:<16} {size / 2**20:10.1f} MiB {size / args.processes:8.1f} bytes/process")
+        return
+
+    if args.suite == 'parser':
+        print(f"{args.processes} processes")
+        for parser_name, seconds, size in bench_parser(scheduler, args.processes, args.repeat):
+            print(f"{parser_name:<18} {seconds * 1000:10.1f} ms {size / seconds / 2**20:8.1f} MiB/s")
+        return
+
+    if args.suite == 'hrrn':
+        print(f"{'processes':>9} {'kinetic (ms)':>13} {'scan (ms)':>10} {'speedup':>8}")
+        for count, kinetic, scan in bench_hrrn(scheduler, args.processes, args.load, args.arrivals, args.repeat):
+            print(f"{count:>9} {kinetic * 1000:>13.1f} {scan * 1000:>10.1f} {scan / kinetic:>7.1f}x")
+        return
+
+    results = bench_schedulers(scheduler, args.processes, args.runfor_scale, args.quanta,
+                               args.algorithms or list(scheduler.SCHEDULERS),
+                               args.repeat, not args.no_memory, args.seed)
+    print(f"{'algorithm':<9} {'processes':>9} {'runfor':>10} {'quantum':>7} {'time (ms)':>10} {'events':>9} "
+          f"{'events/s':>11} {'peak MiB':>9}")
+    for r in results:
+        peak = f"{r['peak_bytes'] / 2**20:9.1f}" if r['peak_bytes'] is not None else f"{'-':>9}"
+        print(f"{r['algorithm']:<9} {r['processes']:>9} {r['runfor']:>10} {r['quantum'] or '-':>7} "
+              f"{r['seconds'] * 1000:>10.1f} {r['events']:>9} {r['events_per_second'] or 0:>11.0f} {peak}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'environment': environment(), 'seed': args.seed, 'results': results}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,143 @@
+"""Golden-output regression harness for every scheduler in the repository.
+
+Runs each implementation against each .in/.out pair in pa1-testfiles-1 (in
+parallel, every run in its own scratch directory so the golden files are never
+overwritten), reports PASS/FAIL with wall time per run, and prints a per-line
+diff for every failure.
+
+Usage: python finalresult/golden_harness.py [--golden DIR] [--json FILE] [--no-diff] [--all]
+"""
+
+import argparse
+import difflib
+import glob
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Script of each implementation and the algorithms it implements. Every script
+# takes the .in file as its only argument; most write the .out file next to it,
+# the ones that don't print their results instead.
+IMPLEMENTATIONS = {
+    'finalresult': ('finalresult/scheduler-gpt.py', ('fcfs', 'sjf', 'rr')),
+    'johnsonlaguerre': ('johnsonlaguerre_pa1/scheduler-get.py', ('fcfs', 'rr')),
+    'stevengrady': ('stevengrady_pa1/process_scheduler.py', ('sjf',)),
+    'emilygensch': ('emilygensch_pa1/FIFO.py', ('fcfs',)),
+    'ethansnead': ('ethansnead_pa1/scheduler-gpt.py', ('fcfs',)),
+    'joshuabyrd': ('joshuabyrd_pa1/fifo_process_scheduler.py', ('fcfs',)),
+}
+
+
+def golden_cases(golden_dir):
+    """(case name, algorithm, .in path, .out path) for every golden pair in `golden_dir`."""
+    cases = []
+    for input_file in sorted(glob.glob(os.path.join(golden_dir, '*.in'))):
+        case = os.path.splitext(os.path.basename(input_file))[0]
+        expected_file = os.path.join(golden_dir, case + '.out')
+        if os.path.exists(expected_file):
+            cases.append((case, case.rsplit('-', 1)[-1], input_file, expected_file))
+    return cases
+
+
+def run_case(implementation, case, input_file, expected_file, timeout):
+    """Run one implementation on one golden input; return a result record."""
+    script = os.path.join(REPO_ROOT, IMPLEMENTATIONS[implementation][0])
+    with tempfile.TemporaryDirectory() as scratch:
+        scratch_input = os.path.join(scratch, case + '.in')
+        shutil.copy(input_file, scratch_input)
+
+        start = perf_counter()
+        try:
+            completed = subprocess.run([sys.executable, script, scratch_input], cwd=scratch,
+                                       capture_output=True, text=True, timeout=timeout)
+        except subprocess.TimeoutExpired:
+            return {'implementation': implementation, 'case': case, 'status': 'ERROR',
+                    'seconds': perf_counter() - start, 'detail': f"timed out after {timeout}s", 'diff': []}
+        seconds = perf_counter() - start
+
+        output_file = os.path.join(scratch, case + '.out')
+        if os.path.exists(output_file):
+            with open(output_file) as f:
+                actual = f.read()
+        else:
+            actual = completed.stdout
+
+    if completed.returncode != 0:
+        error = completed.stderr.strip().splitlines() or completed.stdout.strip().splitlines() or ['']
+        return {'implementation': implementation, 'case': case, 'status': 'ERROR',
+                'seconds': seconds, 'detail': f"exit {completed.returncode}: {error[-1]}", 'diff': []}
+
+    with open(expected_file) as f:
+        expected = f.read()
+    diff = list(difflib.unified_diff(expected.splitlines(), actual.splitlines(),
+                                     f"golden/{case}.out", f"{implementation}/{case}.out", lineterm=''))
+    changed = sum(1 for line in diff if line[:1] in '+-' and line[:3] not in ('+++', '---'))
+    return {'implementation': implementation, 'case': case, 'status': 'FAIL' if diff else 'PASS',
+            'seconds': seconds, 'detail': f"{changed} lines differ" if diff else '', 'diff': diff}
+
+
+def run_harness(golden_dir, implementations, all_algorithms=False, jobs=None, timeout=60):
+    """Run every implementation against every golden case in parallel; return the result records."""
+    runs = []
+    skipped = []
+    for case, algorithm, input_file, expected_file in golden_cases(golden_dir):
+        for implementation in implementations:
+            if all_algorithms or algorithm in IMPLEMENTATIONS[implementation][1]:
+                runs.append((implementation, case, input_file, expected_file, timeout))
+            else:
+                skipped.append({'implementation': implementation, 'case': case, 'status': 'SKIP',
+                                'seconds': 0.0, 'detail': f"does not implement {algorithm}", 'diff': []})
+
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        results = list(pool.map(lambda run: run_case(*run), runs))
+    return sorted(results + skipped, key=lambda r: (list(IMPLEMENTATIONS).index(r['implementation']), r['case']))
+
+
+def print_report(results, show_diff=True):
+    print(f"{'implementation':<16} {'case':<10} {'result':<6} {'time (ms)':>10}  detail")
+    for result in results:
+        print(f"{result['implementation']:<16} {result['case']:<10} {result['status']:<6} "
+              f"{result['seconds'] * 1000:>10.1f}  {result['detail']}")
+
+    if show_diff:
+        for result in results:
+            if result['diff']:
+                print()
+                print('\n'.join(result['diff']))
+
+    counts = {status: sum(1 for r in results if r['status'] == status) for status in ('PASS', 'FAIL', 'ERROR', 'SKIP')}
+    print('\n' + ', '.join(f"{count} {status.lower()}" for status, count in counts.items()))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--golden', default=os.path.join(REPO_ROOT, 'pa1-testfiles-1'), help="directory of .in/.out pairs")
+    parser.add_argument('--implementation', action='append', choices=list(IMPLEMENTATIONS),
+                        help="only run this implementation (repeatable)")
+    parser.add_argument('--all', action='store_true', help="also run implementations on algorithms they do not implement")
+    parser.add_argument('--jobs', type=int, help="parallel runs (default: one per CPU)")
+    parser.add_argument('--timeout', type=float, default=60, help="seconds before a run counts as an error")
+    parser.add_argument('--no-diff', action='store_true', help="only print the summary table")
+    parser.add_argument('--json', help="also write every result, timings included, to this JSON file")
+    args = parser.parse_args()
+
+    results = run_harness(args.golden, args.implementation or list(IMPLEMENTATIONS), args.all, args.jobs, args.timeout)
+    print_report(results, show_diff=not args.no_diff)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if any(result['status'] in ('FAIL', 'ERROR') for result in results):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
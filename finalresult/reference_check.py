@@ -0,0 +1,369 @@
+"""Randomized checks of the scheduler in scheduler-gpt.py against brute-force references.
+
+Each check simulates seeded random workloads and compares the result with a
+simple implementation that is slow but obviously right:
+
+  hrrn        HighestResponseRatioNext (KineticTournament) against a full scan per selection
+  sjf-np      NonPreemptiveShortestJobFirst against a full scan per selection
+  mlfq        MultilevelFeedbackQueue against plain per-level lists, and one level against Round-Robin
+  cores       simulate_cores against a tick-by-tick simulation on 1-4 CPUs, and on one core against simulate
+  checkpoint  runs killed at a random point and resumed with --resume against uninterrupted runs
+
+Usage: python finalresult/reference_check.py [--check NAME ...] [--cases N] [--seed S]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import sys
+import tempfile
+import traceback
+from array import array
+from time import perf_counter
+
+from benchmark import load_scheduler, naive_hrrn
+
+CHECKS = {}  # Name -> (check function, default number of cases)
+
+
+def check(name, cases):
+    def register(function):
+        CHECKS[name] = (function, cases)
+        return function
+    return register
+
+
+def random_workload(rng, count, latest_arrival, longest_burst):
+    names = [f"P{index:02d}" for index in range(count)]
+    arrivals = [rng.randint(0, latest_arrival) for _ in range(count)]
+    bursts = [rng.randint(1, longest_burst) for _ in range(count)]
+    return names, arrivals, bursts
+
+
+def run_policy(scheduler, policy_class, names, arrivals, bursts, run_for, quantum=None, options=None, engine=None):
+    """The timeline and per-process results of one run, as .out text, and the process table."""
+    processes = scheduler.ProcessTable(names, array('q', arrivals), array('q', bursts))
+    out = io.StringIO()
+    timeline = scheduler.EventBuffer([scheduler.TimelineWriter(out, names)])
+    (engine or scheduler.simulate)(policy_class(processes, quantum, options or {}), run_for, timeline)
+    timeline.flush()
+    scheduler.print_output_results(out, run_for, processes)
+    return out.getvalue(), processes
+
+
+def naive_sjf_np(scheduler):
+    """Non-preemptive SJF that scans every waiting process at each selection."""
+
+    class NaiveNonPreemptiveShortestJobFirst(scheduler.SchedulingPolicy):
+        def __init__(self, processes, quantum=None, options=None):
+            super().__init__(processes, quantum, options)
+            self.ready = []  # In arrival order, so the first of equal bursts wins
+
+        def admit(self, process):
+            self.ready.append(process)
+
+        def pick_next(self, time):
+            if not self.ready:
+                return None
+            burst = self.processes.burst
+            return self.ready.pop(min(range(len(self.ready)), key=lambda position: burst[self.ready[position]]))
+
+    return NaiveNonPreemptiveShortestJobFirst
+
+
+def naive_mlfq(scheduler):
+    """MLFQ over one plain list per level, boosting by merging every level into the top one."""
+
+    class NaiveMultilevelFeedbackQueue(scheduler.SchedulingPolicy):
+        time_sliced = True
+
+        def __init__(self, processes, quantum=None, options=None):
+            super().__init__(processes, quantum, options)
+            self.quanta = options['quanta']
+            self.boost = options.get('boost', (0,))[0]
+            self.next_boost = self.boost
+            self.levels = [[] for _ in self.quanta]
+            self.running_level = 0
+
+        def admit(self, process):
+            self.levels[0].append(process)
+
+        def pick_next(self, time):
+            if self.boost and time >= self.next_boost:
+                self.levels = [sum(self.levels, [])] + [[] for _ in self.levels[1:]]
+                self.next_boost = (time // self.boost + 1) * self.boost
+            for level, ready in enumerate(self.levels):
+                if ready:
+                    self.running_level = level
+                    return ready.pop(0)
+            return None
+
+        def slice_length(self, process):
+            return self.quanta[self.running_level]
+
+        def on_slice(self, process):
+            self.levels[min(self.running_level + 1, len(self.levels) - 1)].append(process)
+
+    return NaiveMultilevelFeedbackQueue
+
+
+def tick_reference(algorithm, arrivals, bursts, run_for, quantum, cpus):
+    """Simulate fcfs, sjf or rr on `cpus` cores one time unit at a time.
+
+    Returns each process's (turnaround, response), or None if it did not
+    finish, and the time each core was busy before `run_for`.
+    """
+    count = len(arrivals)
+    remaining = list(bursts)
+    response = [-1] * count
+    finished = [None] * count
+    pending = sorted(range(count), key=lambda process: arrivals[process])
+    ready = []
+    running = [None] * cpus
+    slice_left = [0] * cpus
+    busy = [0] * cpus
+    admitted = {}  # Process -> admission order, the SJF tie-break
+
+    def admit(time):
+        while pending and arrivals[pending[0]] <= time:
+            process = pending.pop(0)
+            admitted[process] = len(admitted)
+            ready.append(process)
+
+    def shortest():
+        return min(ready, key=lambda process: (remaining[process], admitted[process]))
+
+    def start(core, process, time):
+        running[core] = process
+        slice_left[core] = quantum
+        if response[process] == -1:
+            response[process] = time - arrivals[process]
+
+    time = 0
+    while True:
+        if algorithm == 'rr':
+            admit(time)
+        for core, process in enumerate(running):
+            if process is None:
+                continue
+            if remaining[process] == 0 and (algorithm == 'rr' or time <= run_for):
+                finished[process] = time
+                running[core] = None
+            elif algorithm == 'rr' and slice_left[core] == 0:
+                ready.append(process)
+                running[core] = None
+        if algorithm != 'rr' and time < run_for:
+            admit(time)
+
+        if time < run_for:
+            for core in range(cpus):
+                if running[core] is None and ready:
+                    process = shortest() if algorithm == 'sjf' else ready[0]
+                    ready.remove(process)
+                    start(core, process, time)
+            # SJF displaces the lowest-numbered core among those with the most work left
+            while algorithm == 'sjf' and ready and None not in running:
+                most = max(remaining[process] for process in running)
+                core = next(core for core in range(cpus) if remaining[running[core]] == most)
+                process = shortest()
+                if remaining[process] >= most:
+                    break
+                ready.remove(process)
+                ready.append(running[core])
+                start(core, process, time)
+
+        active = any(process is not None for process in running)
+        if algorithm == 'rr' and (not active and not pending or time >= run_for and not active):
+            break
+        if algorithm != 'rr' and time >= run_for:
+            break
+        for core, process in enumerate(running):
+            if process is not None:
+                remaining[process] -= 1
+                slice_left[core] -= 1
+                if time < run_for:
+                    busy[core] += 1
+        time += 1
+
+    results = [(finished[process] - arrivals[process], response[process]) if finished[process] is not None else None
+               for process in range(count)]
+    return results, busy
+
+
+@check('hrrn', 2000)
+def check_hrrn(scheduler, rng, cases):
+    naive = naive_hrrn(scheduler)
+    for case in range(cases):
+        workload = random_workload(rng, rng.randint(1, 25), rng.choice([3, 20, 60]), rng.choice([3, 12]))
+        run_for = rng.randint(1, 200)
+        expected, _ = run_policy(scheduler, naive, *workload, run_for)
+        actual, _ = run_policy(scheduler, scheduler.HighestResponseRatioNext, *workload, run_for)
+        assert actual == expected, f"case {case}: {workload}, runfor {run_for}"
+
+
+@check('sjf-np', 2000)
+def check_sjf_np(scheduler, rng, cases):
+    naive = naive_sjf_np(scheduler)
+    for case in range(cases):
+        workload = random_workload(rng, rng.randint(1, 25), rng.choice([3, 20, 60]), rng.choice([3, 12]))
+        run_for = rng.randint(1, 200)
+        expected, _ = run_policy(scheduler, naive, *workload, run_for)
+        actual, _ = run_policy(scheduler, scheduler.NonPreemptiveShortestJobFirst, *workload, run_for)
+        assert actual == expected, f"case {case}: {workload}, runfor {run_for}"
+
+
+@check('mlfq', 2000)
+def check_mlfq(scheduler, rng, cases):
+    naive = naive_mlfq(scheduler)
+    for case in range(cases):
+        workload = random_workload(rng, rng.randint(1, 15), 40, 20)
+        run_for = rng.randint(1, 150)
+        options = {'quanta': tuple(rng.randint(1, 6) for _ in range(rng.randint(1, 4)))}
+        if rng.random() < 0.7:
+            options['boost'] = (rng.randint(1, 25),)
+        expected, _ = run_policy(scheduler, naive, *workload, run_for, options=options)
+        actual, _ = run_policy(scheduler, scheduler.MultilevelFeedbackQueue, *workload, run_for, options=options)
+        assert actual == expected, f"case {case}: {workload}, runfor {run_for}, {options}"
+
+        # With a single level, MLFQ is Round-Robin
+        quantum = rng.randint(1, 5)
+        round_robin, _ = run_policy(scheduler, scheduler.RoundRobin, *workload, run_for, quantum)
+        one_level, _ = run_policy(scheduler, scheduler.MultilevelFeedbackQueue, *workload, run_for,
+                                  options={'quanta': (quantum,)})
+        assert one_level == round_robin, f"case {case}: one level differs from rr, quantum {quantum}"
+
+
+@check('cores', 2000)
+def check_cores(scheduler, rng, cases):
+    for case in range(cases):
+        names, arrivals, bursts = random_workload(rng, rng.randint(1, 14), rng.choice([5, 30, 60]), 12)
+        run_for = rng.randint(1, 90)
+        algorithm = rng.choice(['fcfs', 'sjf', 'rr'])
+        quantum = rng.randint(1, 4)
+        cpus = rng.randint(1, 4)
+        processes = scheduler.ProcessTable(names, array('q', arrivals), array('q', bursts))
+        busy, _, _ = scheduler.simulate_cores(scheduler.SCHEDULERS[algorithm](processes, quantum), run_for,
+                                              scheduler.NullTimeline(), cpus)
+        actual = [(processes.turnaround[process], processes.response[process]) if processes.completed[process] else None
+                  for process in range(len(names))]
+        assert (actual, busy) == tick_reference(algorithm, arrivals, bursts, run_for, quantum, cpus), \
+            f"case {case}: {algorithm} on {cpus} CPUs, {arrivals}, {bursts}, runfor {run_for}, quantum {quantum}"
+
+        # On one core, every policy comes out exactly as under simulate
+        algorithm = rng.choice(list(scheduler.SCHEDULERS))
+        options = {'boost': (rng.randint(1, 20),)} if algorithm == 'mlfq' and rng.random() < 0.5 else {}
+        policy = scheduler.SCHEDULERS[algorithm]
+        single, single_table = run_policy(scheduler, policy, names, arrivals, bursts, run_for, quantum, options)
+        one_core, one_core_table = run_policy(scheduler, policy, names, arrivals, bursts, run_for, quantum, options,
+                                              lambda policy, run_for, timeline: scheduler.simulate_cores(policy, run_for,
+                                                                                                         timeline, 1))
+        assert (one_core, one_core_table.remaining) == (single, single_table.remaining), \
+            f"case {case}: {algorithm} on one core differs from simulate"
+
+
+class Crash(Exception):
+    pass
+
+
+@check('checkpoint', 300)
+def check_checkpoint(scheduler, rng, cases):
+    class CrashingCheckpointer(scheduler.Checkpointer):
+        """Checkpoints at random iterations and crashes at iteration `crash_at`."""
+        crash_at = None
+
+        def due(self):
+            CrashingCheckpointer.crash_at -= 1
+            if CrashingCheckpointer.crash_at == 0:
+                raise Crash
+            return rng.random() < 0.5
+
+    outputs = ('.out', '.jsonl', '.csv', '.gantt.csv')
+    with tempfile.TemporaryDirectory() as scratch:
+        input_file = os.path.join(scratch, 'case.in')
+        for case in range(cases):
+            algorithm = rng.choice(list(scheduler.SCHEDULERS))
+            names, arrivals, bursts = random_workload(rng, rng.randint(1, 30), 150, 15)
+            lines = [f"processcount {len(names)}", f"runfor {rng.randint(1, 300)}", f"use {algorithm}",
+                     f"quantum {rng.randint(1, 5)}"]
+            if rng.random() < 0.3:
+                lines.append(f"cpus {rng.randint(2, 4)}")
+            if rng.random() < 0.3:
+                lines.append(f"contextswitch {rng.randint(0, 2)} {rng.randint(0, 1)}")
+            if algorithm == 'mlfq' and rng.random() < 0.5:
+                lines.append(f"boost {rng.randint(1, 30)}")
+            lines += [f"process name {name} arrival {arrival} burst {burst}"
+                      for name, arrival, burst in zip(names, arrivals, bursts)]
+            with open(input_file, 'w') as f:
+                f.write('\n'.join(lines) + '\nend\n')
+
+            settings = {'compact': rng.random() < 0.5, 'use_cache': False, 'summary': rng.random() < 0.5,
+                        'emit': ('jsonl', 'csv', 'columnar')}
+            expected = {}
+            for name in ('reference', 'resumed'):
+                stem = os.path.join(scratch, name)
+                settings['gantt'] = stem + '.gantt.csv'
+                if name == 'reference':
+                    scheduler.simulate_file(input_file, stem + '.out', **settings)
+                    expected = {suffix: open(stem + suffix).read() for suffix in outputs}
+                    expected_events = scheduler.read_event_columns(stem + '.cols')
+                    continue
+
+                CrashingCheckpointer.crash_at = rng.randint(1, 60)
+                scheduler.Checkpointer, original = CrashingCheckpointer, scheduler.Checkpointer
+                try:
+                    scheduler.simulate_file(input_file, stem + '.out', checkpoint_interval=0, **settings)
+                except Crash:
+                    scheduler.Checkpointer = original
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        scheduler.simulate_file(input_file, stem + '.out', resume=True, **settings)
+                finally:
+                    scheduler.Checkpointer = original
+
+                for suffix in outputs:
+                    assert open(stem + suffix).read() == expected[suffix], f"case {case}: {suffix} differs\n" + \
+                        '\n'.join(lines)
+                assert scheduler.read_event_columns(stem + '.cols') == expected_events, f"case {case}: .cols differs"
+                assert not os.path.exists(stem + '.ckpt'), f"case {case}: checkpoint left behind"
+
+
+def run_checks(scheduler, names, cases=None, seed=1):
+    """Run each named check; return (name, cases, passed, seconds, detail) records."""
+    results = []
+    for name in names:
+        function, default_cases = CHECKS[name]
+        count = cases or default_cases
+        start = perf_counter()
+        try:
+            function(scheduler, random.Random(seed), count)
+            passed, detail = True, ''
+        except AssertionError as error:
+            passed, detail = False, str(error)
+        except Exception:
+            passed, detail = False, traceback.format_exc()
+        results.append((name, count, passed, perf_counter() - start, detail))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--check', action='append', choices=list(CHECKS), help="only run this check (repeatable)")
+    parser.add_argument('--cases', type=int, help="random cases per check (default: each check's own)")
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    results = run_checks(load_scheduler(), args.check or list(CHECKS), args.cases, args.seed)
+    print(f"{'check':<12} {'cases':>6} {'result':<6} {'time (ms)':>10}")
+    for name, count, passed, seconds, _ in results:
+        print(f"{name:<12} {count:>6} {'PASS' if passed else 'FAIL':<6} {seconds * 1000:>10.1f}")
+    for name, _, passed, _, detail in results:
+        if not passed:
+            print(f"\n{name}: {detail}")
+
+    if not all(passed for _, _, passed, _, _ in results):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
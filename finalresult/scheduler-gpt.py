@@ -5,66 +5,230 @@
 #Emily Gensch
 
 
+import argparse
+import contextlib
+import cProfile
+import csv
+import filecmp
+import glob
+import html
+import io
+import json
+import math
+import mmap
+import multiprocessing
 import os
+import pickle
+import pstats
+import re
+import struct
 import sys
+from array import array
 from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from heapq import heappop, heappush, heapreplace
+from itertools import accumulate, islice, repeat, takewhile
+from time import perf_counter
 
-class Process:
-    def __init__(self, name, arrival_time, burst_time):
-        self.name = name
-        self.arrival_time = arrival_time
-        self.burst_time = burst_time
-        self.remaining_time = burst_time
-        self.wait_time = 0
-        self.turnaround_time = 0
-        self.response_time = -1  # Initialized as -1 to detect first response
-        self.completed = False
-        self.appended = False # JL: I added this attribute.
-
-    def __repr__(self):
-        return (f"Process(name={self.name}, arrival_time={self.arrival_time}, "
-                f"burst_time={self.burst_time}, wait_time={self.wait_time}, "
-                f"turnaround_time={self.turnaround_time}, response_time={self.response_time})")
-
-def parse_input_file(file_path):
-    process_count = None
-    run_for = None
-    scheduling_algo = None
-    quantum = None
-    processes = []
+IDLE_RANGE = re.compile(r"Time (\d+)-(\d+): Idle$")
+
+# Compiled workload (.inb) header: magic, version, byte order mark, source mtime_ns,
+# source size, processcount, number of processes, runfor, quantum (-1 for none),
+# length of the settings text (the algorithm name, then one line per option directive)
+WORKLOAD_HEADER = struct.Struct('=4sIqqqqqqqq')
+WORKLOAD_MAGIC = b'PA1W'
+WORKLOAD_VERSION = 3
+BYTE_ORDER_MARK = 0x0102030405060708
+
+# Kinds of the typed event records (kind, time, process, arg, cpu) the simulation
+# reports. `arg` is the burst of a selection or the end of an idle stretch;
+# `process` is -1 for idle stretches and `cpu` is None unless several CPUs run
+# (-1 in the columnar dump).
+ARRIVED, SELECTED, FINISHED, IDLE = range(4)
+EVENT_KINDS = ('arrived', 'selected', 'finished', 'idle')
+
+# Columnar event dump (.cols) header: magic, version, byte order mark, length of
+# the JSON metadata (process names, column names and typecodes, event kinds).
+# Blocks follow, each an event count and then every column's raw values.
+EVENTS_HEADER = struct.Struct('=4sIqq')
+EVENTS_MAGIC = b'PA1E'
+EVENTS_VERSION = 1
+EVENT_COLUMNS = (('kind', 'b'), ('time', 'q'), ('process', 'q'), ('arg', 'q'), ('cpu', 'q'))
+
+# A time no simulation reaches, for "no event due"; it still fits an array('q')
+NEVER = 1 << 62
+
+class ProcessTable:
+    """Struct-of-arrays process table.
+
+    A process is a row index. `names`, `arrival` and `burst` describe the workload,
+    while `remaining`, `wait`, `turnaround`, `response` and `completed` are the
+    per-run columns. The numeric columns are flat `array` buffers (8 bytes per
+    value), so a million-process trace costs tens of megabytes rather than a
+    Python object with its own `__dict__` per process.
+    """
+
+    def __init__(self, names, arrival, burst):
+        self.names = names
+        self.arrival = arrival
+        self.burst = burst
+        self.reset()
+
+    def __len__(self):
+        return len(self.names)
+
+    def reset(self):
+        """(Re)initialize the per-run columns."""
+        n = len(self.names)
+        self.remaining = array('q')
+        self.remaining.frombytes(memoryview(self.burst).cast('B'))
+        self.wait = array('q', bytes(8 * n))
+        self.turnaround = array('q', bytes(8 * n))
+        self.response = array('q', [-1]) * n  # -1 until the process is first selected
+        self.completed = bytearray(n)
+
+    def finish(self, index, time):
+        """Record that process `index` completed at `time`."""
+        self.remaining[index] = 0
+        self.completed[index] = 1
+        self.turnaround[index] = time - self.arrival[index]
+        self.wait[index] = self.turnaround[index] - self.burst[index]
+
+    def fork(self):
+        """A table over the same workload columns (shared, not copied) with its own per-run columns."""
+        return ProcessTable(self.names, self.arrival, self.burst)
+
+    def averages(self):
+        """(mean wait, mean turnaround, mean response, processes finished); the means are None if none finished."""
+        finished = self.completed.count(1)
+        if not finished:
+            return None, None, None, 0
+        completed = self.completed
+        wait = sum(w for w, done in zip(self.wait, completed) if done)
+        turnaround = sum(t for t, done in zip(self.turnaround, completed) if done)
+        response = sum(r for r, done in zip(self.response, completed) if done)
+        return wait / finished, turnaround / finished, response / finished, finished
+
+# Directives that configure a particular scheduler, or the simulation (`cpus N`,
+# `contextswitch C [S]`), rather than every run; each one takes a list of integers.
+# register_scheduler adds the scheduler ones.
+OPTION_DIRECTIVES = {'cpus', 'contextswitch'}
+
+def parse_directive(tokens, parameters, options):
+    """Apply a processcount/runfor/use/quantum line to `parameters`, or an option
+    directive line to `options`; False for any other line."""
+    if tokens[0] == 'use':
+        parameters['use'] = tokens[1]
+    elif tokens[0] in ('processcount', 'runfor', 'quantum'):
+        parameters[tokens[0]] = int(tokens[1])
+    elif tokens[0] in OPTION_DIRECTIVES:
+        # Every argument up to a trailing comment
+        options[tokens[0]] = tuple(int(token) for token in takewhile(lambda t: not t.startswith('#'), tokens[1:]))
+    else:
+        return False
+    return True
+
+def parse_input_lines(file_path, check_use=True):
+    """Line-by-line parser; accepts process arguments in any order and anywhere in the file."""
+    parameters = dict.fromkeys(('processcount', 'runfor', 'use', 'quantum'))
+    options = {}
+    names = []
+    arrivals = array('q')
+    bursts = array('q')
 
     with open(file_path, 'r') as file:
         for line in file:
             tokens = line.strip().split()
 
-            if not tokens:
+            if not tokens or parse_directive(tokens, parameters, options):
                 continue
 
-            if tokens[0] == 'processcount':
-                process_count = int(tokens[1])
+            if tokens[0] == 'process':
+                # Parse process arguments like name P1 arrival 0 burst 5 (space between arguments)
+                process_args = {tokens[i]: tokens[i + 1] for i in range(1, len(tokens), 2)}
+                names.append(process_args['name'])
+                arrivals.append(int(process_args['arrival']))
+                bursts.append(int(process_args['burst']))
 
-            elif tokens[0] == 'runfor':
-                run_for = int(tokens[1])
+            elif tokens[0] == 'end':
+                break
 
-            elif tokens[0] == 'use':
-                scheduling_algo = tokens[1]
+    return checked_parameters(parameters, options, check_use) + (ProcessTable(names, arrivals, bursts),)
 
-            elif tokens[0] == 'quantum':
-                quantum = int(tokens[1])
+def parse_input_file(file_path, chunk_size=1 << 23, check_use=True):
+    """Bulk parser for large .in files.
 
-            elif tokens[0] == 'process':
-                # Parse process arguments like name P1 arrival 0 burst 5 (space between arguments)
-                process_args = {tokens[i]: tokens[i + 1] for i in range(1, len(tokens), 2)}
-                name = process_args['name']
-                arrival = int(process_args['arrival'])
-                burst = int(process_args['burst'])
+    The header lines are read one at a time. The process records after them are
+    memory-mapped and tokenized in chunks of about `chunk_size` bytes (cut at a
+    line break): one split() per chunk, then every 7th token goes straight into
+    the name, arrival and burst columns. Anything other than plain
+    `process name X arrival A burst B` lines up to `end` (comments, another
+    argument order, directives between the processes) falls back to
+    parse_input_lines.
+    """
+    parameters = dict.fromkeys(('processcount', 'runfor', 'use', 'quantum'))
+    options = {}
+    names = []
+    arrivals = array('q')
+    bursts = array('q')
 
-                process = Process(name, arrival, burst)
-                processes.append(process)
+    with open(file_path, 'rb') as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return parse_input_lines(file_path, check_use)
 
-            elif tokens[0] == 'end':
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            # Header: directives up to the first process line
+            body_start = body_end = len(data)
+            for line in iter(data.readline, b''):
+                tokens = line.decode().split()
+                if not tokens or parse_directive(tokens, parameters, options):
+                    continue
+                if tokens[0] == 'end':
+                    break
+                if tokens[0] != 'process':
+                    continue
+                body_start = data.tell() - len(line)
+                body_end = first_line_starting(data, b'end', body_start)
                 break
 
+            # Body: fixed-stride process records, a chunk at a time
+            position = body_start
+            while position < body_end:
+                cut = data.find(b'\n', position + chunk_size, body_end)
+                cut = body_end if cut == -1 else cut + 1
+                tokens = data[position:cut].decode().split()
+                position = cut
+
+                count = len(tokens) // 7
+                if (len(tokens) != 7 * count or tokens[0::7].count('process') != count
+                        or tokens[1::7].count('name') != count or tokens[3::7].count('arrival') != count
+                        or tokens[5::7].count('burst') != count):
+                    return parse_input_lines(file_path, check_use)
+                names.extend(tokens[2::7])
+                arrivals.extend(map(int, tokens[4::7]))
+                bursts.extend(map(int, tokens[6::7]))
+
+    return checked_parameters(parameters, options, check_use) + (ProcessTable(names, arrivals, bursts),)
+
+def first_line_starting(data, word, start):
+    """Offset of the first line at or after `start` whose first token is `word`, or len(data)."""
+    position = data.find(b'\n' + word, start - 1)
+    while position != -1:
+        following = position + 1 + len(word)
+        if following == len(data) or data[following:following + 1].isspace():
+            return position + 1
+        position = data.find(b'\n' + word, following)
+    return len(data)
+
+def checked_parameters(parameters, options, check_use=True):
+    """(processcount, runfor, use, quantum, options), exiting with an error if any required one is
+    missing or the scheduler cannot run with them.
+
+    With `check_use` false the `use` line and the settings only its scheduler
+    needs are not checked, for the modes that run other schedulers instead.
+    """
+    process_count, run_for, scheduling_algo, quantum = parameters.values()
+
     # Error checking for missing parameters
     if process_count is None:
         print("Error: Missing parameter processcount")
@@ -72,225 +236,1979 @@ def parse_input_file(file_path):
     if run_for is None:
         print("Error: Missing parameter runfor")
         sys.exit(1)
-    if scheduling_algo is None:
+    if check_use and scheduling_algo is None:
         print("Error: Missing parameter use")
         sys.exit(1)
-    if scheduling_algo == 'rr' and quantum is None:
-        print("Error: Missing quantum parameter when use is 'rr'")
+    if check_use and scheduling_algo not in SCHEDULERS:
+        print(f"Error: Unknown scheduling algorithm '{scheduling_algo}' (expected one of {', '.join(SCHEDULERS)})")
+        sys.exit(1)
+    if 'cpus' in options and (len(options['cpus']) != 1 or options['cpus'][0] < 1):
+        print("Error: cpus takes one value, at least 1")
+        sys.exit(1)
+    if 'contextswitch' in options and (len(options['contextswitch']) not in (1, 2) or min(options['contextswitch']) < 0):
+        print("Error: contextswitch takes a cost and an optional same-process cost, neither negative")
+        sys.exit(1)
+    error = SCHEDULERS[scheduling_algo].check_parameters(quantum, options) if check_use else None
+    if error is not None:
+        print(f"Error: {error}")
         sys.exit(1)
 
-    return process_count, run_for, scheduling_algo, quantum, processes
+    return process_count, run_for, scheduling_algo, quantum, options
 
-def round_robin_scheduling(processes, run_for, quantum):
-    time = 0
-    ready_queue = deque()
-    timeline = []
-    active_processes = {p.name: p for p in processes}
+def compiled_path(input_file):
+    """Where the compiled form of `input_file` is cached: next to it, with a .inb extension."""
+    return os.path.splitext(input_file)[0] + '.inb'
 
-    # Simulation loop
-    while time < run_for:
-        # Check if any processes are arriving at the current time
-        for process in processes:
-            
-            # JL: I added the process.appended check.
-            if process.arrival_time == time and process.appended == False:
-                ready_queue.append(process)
-                timeline.append(f"Time {time}: {process.name} arrived")
-        
-        # If there's a process in the ready queue, process it
-        if ready_queue:
-            current_process = ready_queue.popleft()
-
-            # If the process is selected for the first time, log it and set response time
-            if current_process.response_time == -1:
-                current_process.response_time = time - current_process.arrival_time
-
-            timeline.append(f"Time {time}: {current_process.name} selected (burst {current_process.remaining_time})")
-
-            # Run the process for the quantum or for its remaining time, whichever is smaller
-            time_slice = min(quantum, current_process.remaining_time)
-            current_process.remaining_time -= time_slice
-            time += time_slice
-            
-            # Check if any processes are arriving during this time slice
-            # JL: I widened the range by 1 to the right.
-            for t in range(time - time_slice, time+1):
-                for process in processes:
-                    
-                    # JL: I added the "process.response_time == -1" check and "process.appended" modification.
-                    if process.arrival_time == t and process.response_time == -1 and process.completed == False and process not in ready_queue and process.remaining_time > 0:
-                        process.appended = True
-                        ready_queue.append(process)
-                        timeline.append(f"Time {t}: {process.name} arrived")
-                        
-            # If the process finishes
-            if current_process.remaining_time == 0:
-                current_process.completed = True
-                current_process.turnaround_time = time - current_process.arrival_time
-                current_process.wait_time = current_process.turnaround_time - current_process.burst_time
-                timeline.append(f"Time {time}: {current_process.name} finished")
+def write_compiled_workload(path, source_stat, process_count, run_for, scheduling_algo, quantum, options, processes):
+    """Save a parsed workload in the binary .inb format.
+
+    Layout (native byte order, every section 8-byte aligned so the columns can be
+    mapped in place): the WORKLOAD_HEADER fields, the settings text, then the
+    arrival column, the burst column, the name offsets (one per process plus an
+    end offset) and the UTF-8 name blob, each name followed by a newline. The
+    header keeps the mtime and size of the source .in file, so a stale cache is
+    detected without reading the text again.
+    """
+    encoded_names = [name.encode() + b'\n' for name in processes.names]
+    name_offsets = array('q', accumulate(map(len, encoded_names), initial=0))
+    algo = '\n'.join([scheduling_algo] + [' '.join(map(str, (key,) + value)) for key, value in options.items()]).encode()
+
+    temporary = path + '.tmp'
+    with open(temporary, 'wb') as f:
+        f.write(WORKLOAD_HEADER.pack(WORKLOAD_MAGIC, WORKLOAD_VERSION, BYTE_ORDER_MARK, source_stat.st_mtime_ns,
+                                     source_stat.st_size, process_count, len(processes), run_for,
+                                     -1 if quantum is None else quantum, len(algo)))
+        f.write(algo.ljust(padded(len(algo)), b'\0'))
+        f.write(processes.arrival)
+        f.write(processes.burst)
+        f.write(name_offsets)
+        f.write(b''.join(encoded_names))
+    os.replace(temporary, path)
+
+def read_compiled_workload(path, source_stat):
+    """Load a .inb file and return the parse_input_file tuple, or None if it is missing or stale.
+
+    The columns are copied out of the mapping in one block each, because the
+    schedulers index an `array` faster than a memoryview, and the names come out
+    of the blob with a single decode and split.
+    """
+    try:
+        with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            if len(data) < WORKLOAD_HEADER.size:
+                return None
+            (magic, version, byte_order, mtime_ns, size, process_count, count,
+             run_for, quantum, algo_length) = WORKLOAD_HEADER.unpack_from(data)
+            if ((magic, version, byte_order, mtime_ns, size) !=
+                    (WORKLOAD_MAGIC, WORKLOAD_VERSION, BYTE_ORDER_MARK, source_stat.st_mtime_ns, source_stat.st_size)):
+                return None
+
+            position = WORKLOAD_HEADER.size
+            scheduling_algo, *option_lines = data[position:position + algo_length].decode().split('\n')
+            options = {}
+            for line in option_lines:
+                key, *values = line.split()
+                options[key] = tuple(map(int, values))
+            position += padded(algo_length)
+            arrivals, bursts = array('q'), array('q')
+            for column in (arrivals, bursts):
+                column.frombytes(data[position:position + 8 * count])
+                position += 8 * count
+            position += 8 * (count + 1)  # Name offsets, only needed for random access
+            names = data[position:].decode().split('\n')[:count]
+    except (OSError, ValueError):
+        return None
+
+    return (process_count, run_for, scheduling_algo, None if quantum == -1 else quantum, options,
+            ProcessTable(names, arrivals, bursts))
+
+def padded(length):
+    return (length + 7) // 8 * 8
+
+def load_workload(input_file, use_cache=True, check_use=True):
+    """parse_input_file, going through the compiled .inb cache next to `input_file`.
+
+    A cache that matches the .in file's mtime and size is mapped instead of
+    parsing the text; otherwise the text is parsed and the cache (re)written.
+    Reading a cache skips the checks, so one parsed with `check_use` false is
+    not written.
+    """
+    if not use_cache:
+        return parse_input_file(input_file, check_use=check_use)
+
+    source_stat = os.stat(input_file)
+    cache_file = compiled_path(input_file)
+    workload = read_compiled_workload(cache_file, source_stat)
+    if workload is None:
+        workload = parse_input_file(input_file, check_use=check_use)
+        if not check_use:
+            return workload
+        try:
+            write_compiled_workload(cache_file, source_stat, *workload)
+        except OSError:
+            pass  # A read-only directory just means no cache
+    return workload
+
+class ArrivalIndex:
+    """Process indices sorted once by arrival time and handed out through a cursor.
+
+    Admission costs amortized O(1) per process instead of a scan of every process
+    at every step. Ties keep their input order, like the schedulers always have.
+    """
+
+    def __init__(self, processes):
+        self.arrival = processes.arrival
+        self.pending = array('q', sorted(range(len(processes)), key=self.arrival.__getitem__))
+        self.cursor = 0
+
+        # Negative arrival times never come up on the clock, so they are never admitted
+        while self.cursor < len(self.pending) and self.arrival[self.pending[self.cursor]] < 0:
+            self.cursor += 1
+
+    def admit(self, time):
+        """Return the not yet admitted processes that have arrived by `time`."""
+        arrival, pending = self.arrival, self.pending
+        start = end = self.cursor
+        while end < len(pending) and arrival[pending[end]] <= time:
+            end += 1
+        self.cursor = end
+        return pending[start:end]
+
+    def next_arrival(self, run_for):
+        """The next arrival that has not been admitted yet, capped at `run_for`."""
+        if self.cursor < len(self.pending):
+            return min(self.arrival[self.pending[self.cursor]], run_for)
+        return run_for
+
+class EventBuffer:
+    """Event sink that records typed events into a preallocated buffer.
+
+    Each event is stored as one (kind, time, process, arg, cpu) record in a slot
+    of a list allocated once, so reporting an event formats nothing. When
+    `capacity` events have gathered, or on flush(), the batch goes to every
+    consumer's write_events(events, end) and the slots are reused; the consumers
+    turn the records into text, JSON or columns a batch at a time.
+    """
+
+    def __init__(self, consumers, capacity=4096):
+        self.consumers = consumers
+        self.events = [None] * capacity
+        self.capacity = capacity
+        self.end = 0
+
+    def arrived(self, time, process):
+        end = self.end
+        self.events[end] = (ARRIVED, time, process, 0, None)
+        self.end = end = end + 1
+        if end == self.capacity:
+            self._dispatch()
+
+    def selected(self, time, process, burst, cpu=None):
+        end = self.end
+        self.events[end] = (SELECTED, time, process, burst, cpu)
+        self.end = end = end + 1
+        if end == self.capacity:
+            self._dispatch()
+
+    def finished(self, time, process, cpu=None):
+        end = self.end
+        self.events[end] = (FINISHED, time, process, 0, cpu)
+        self.end = end = end + 1
+        if end == self.capacity:
+            self._dispatch()
+
+    def idle(self, start, end):
+        slot = self.end
+        self.events[slot] = (IDLE, start, -1, end, None)
+        self.end = slot = slot + 1
+        if slot == self.capacity:
+            self._dispatch()
+
+    def _dispatch(self):
+        for consumer in self.consumers:
+            consumer.write_events(self.events, self.end)
+        self.end = 0
+
+    def flush(self):
+        """Hand the buffered events to the consumers and have them write everything out."""
+        if self.end:
+            self._dispatch()
+        for consumer in self.consumers:
+            consumer.flush()
+
+class TimelineWriter:
+    """Event consumer that streams the timeline into the open .out file.
+
+    Formats each batch of typed events from an EventBuffer as .out lines and
+    writes them in one go, so memory stays bounded no matter how long the run
+    is. With `compact`, an idle stretch becomes a single `Time a-b: Idle` line
+    covering ticks a..b; otherwise it is written one line per tick in chunks of
+    `buffer_lines`.
+    """
+
+    def __init__(self, file, names, compact=False, buffer_lines=4096):
+        self.file = file
+        self.names = names
+        self.compact = compact
+        self.buffer_lines = buffer_lines
+
+    def write_events(self, events, end):
+        names = self.names
+        lines = []
+        append = lines.append
+        for kind, time, process, arg, cpu in islice(events, end):
+            if kind == SELECTED:
+                on_cpu = f" on CPU {cpu}" if cpu is not None else ''
+                append(f"Time {time}: {names[process]} selected (burst {arg}){on_cpu}\n")
+            elif kind == ARRIVED:
+                append(f"Time {time}: {names[process]} arrived\n")
+            elif kind == FINISHED:
+                on_cpu = f" on CPU {cpu}" if cpu is not None else ''
+                append(f"Time {time}: {names[process]} finished{on_cpu}\n")
+            elif self.compact and arg - time > 1:
+                append(f"Time {time}-{arg - 1}: Idle\n")
             else:
-                ready_queue.append(current_process)  # Put back into the queue if not finished
-            
+                self.file.write(''.join(lines))
+                lines.clear()
+                self._idle(time, arg)
+        self.file.write(''.join(lines))
+
+    def _idle(self, start, end):
+        """Write one Idle line per tick of the idle stretch [start, end)."""
+        for chunk in range(start, end, self.buffer_lines):
+            self.file.write(''.join(f"Time {t}: Idle\n" for t in range(chunk, min(chunk + self.buffer_lines, end))))
+
+    def flush(self):
+        pass
+
+class NullTimeline:
+    """Event sink for runs that only need the metrics, not the timeline."""
+
+    def arrived(self, time, process):
+        pass
+
+    def selected(self, time, process, burst, cpu=None):
+        pass
+
+    def finished(self, time, process, cpu=None):
+        pass
+
+    def idle(self, start, end):
+        pass
+
+    def flush(self):
+        pass
+
+class QuantileSketch:
+    """Mergeable quantile sketch for non-negative values with a bounded relative error.
+
+    Values go into logarithmic buckets (bucket i holds (gamma^(i-1), gamma^i]),
+    so memory grows with the log of the value range, never with the number of
+    values, and two sketches merge by adding bucket counts. A bucket's
+    representative value is within `accuracy` (relative) of every value in it;
+    since the metrics are whole time units, it is rounded, so a reported
+    quantile is within `accuracy` plus half a time unit of the true one (and
+    exact for small values).
+    """
+
+    def __init__(self, accuracy=0.01):
+        self.gamma = (1 + accuracy) / (1 - accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.buckets = {}
+        self.zeros = 0
+        self.count = 0
+
+    def add(self, value):
+        self.count += 1
+        if value <= 0:
+            self.zeros += 1
+            return
+        bucket = math.ceil(math.log(value) / self.log_gamma)
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+
+    def merge(self, other):
+        """Add the values counted by `other`, a sketch with the same accuracy."""
+        self.count += other.count
+        self.zeros += other.zeros
+        for bucket, count in other.buckets.items():
+            self.buckets[bucket] = self.buckets.get(bucket, 0) + count
+
+    def quantile(self, q):
+        """The value at quantile `q` (0..1), or None if the sketch is empty."""
+        if not self.count:
+            return None
+        rank = max(math.ceil(q * self.count) - 1, 0)  # Nearest rank, counted from 0
+        seen = self.zeros
+        if rank < seen:
+            return 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if rank < seen:
+                return round(2 * self.gamma ** bucket / (self.gamma + 1))
+        return round(2 * self.gamma ** max(self.buckets) / (self.gamma + 1))
+
+class RunSummary:
+    """Aggregate metrics of a run, kept up to date as processes finish.
+
+    Holds a running sum and a QuantileSketch per metric (wait, turnaround,
+    response) plus the idle time, so its size does not depend on how many
+    processes there are.
+    """
+
+    METRICS = ('wait', 'turnaround', 'response')
+    QUANTILES = (0.5, 0.95, 0.99)
+
+    def __init__(self):
+        self.finished = 0
+        self.totals = dict.fromkeys(self.METRICS, 0)
+        self.sketches = {metric: QuantileSketch() for metric in self.METRICS}
+        self.idle_time = 0
+
+    def add(self, processes, process):
+        """Count the metrics of `process`, which has just finished."""
+        self.finished += 1
+        for metric in self.METRICS:
+            value = getattr(processes, metric)[process]
+            self.totals[metric] += value
+            self.sketches[metric].add(value)
+
+    def utilization(self, run_for, usage=None):
+        """(busy time, CPU time available) over `run_for`, from run_scheduler's `usage` when it has one."""
+        if usage is not None:
+            return sum(usage[0]), run_for * len(usage[0])
+        return run_for - self.idle_time, run_for
+
+    def write(self, f, run_for, process_total, usage=None):
+        """Write the summary section: throughput, utilization, idle time and a table of the metrics."""
+        f.write('\n')
+        f.write("Summary\n")
+        f.write(f"Finished {self.finished} of {process_total} processes, "
+                f"throughput {self.finished / run_for if run_for else 0:.4f} per time unit\n")
+        f.write(f"CPU utilization {percent(*self.utilization(run_for, usage))}, idle {self.idle_time}\n")
+
+        f.write(f"{'':<10} {'mean':>10} {'p50':>8} {'p95':>8} {'p99':>8}\n")
+        for metric in self.METRICS:
+            if not self.finished:
+                f.write(f"{metric:<10} {'-':>10} {'-':>8} {'-':>8} {'-':>8}\n")
+                continue
+            quantiles = ''.join(f" {self.sketches[metric].quantile(q):>8}" for q in self.QUANTILES)
+            f.write(f"{metric:<10} {self.totals[metric] / self.finished:>10.2f}{quantiles}\n")
+
+class SummarySink:
+    """Event consumer that feeds `summary` as processes finish and the CPUs sit idle."""
+
+    def __init__(self, processes, summary):
+        self.processes = processes
+        self.summary = summary
+
+    def write_events(self, events, end):
+        for kind, time, process, arg, _ in islice(events, end):
+            if kind == FINISHED:
+                self.summary.add(self.processes, process)
+            elif kind == IDLE:
+                self.summary.idle_time += arg - time
+
+    def flush(self):
+        pass
+
+class EventWriter:
+    """Base of the machine-readable event consumers, which write the typed records of an EventBuffer."""
+
+    def start(self):
+        """Write whatever a new file begins with."""
+
+    def write_events(self, events, end):
+        raise NotImplementedError
+
+    def flush(self):
+        pass
+
+class JsonlEventWriter(EventWriter):
+    """Writes one JSON object per event, e.g. {"time": 12, "event": "selected", "process": "P03", "burst": 3}.
+
+    An idle stretch is a single {"time": start, "event": "idle", "end": end}
+    record rather than one per tick, and "cpu" is only present on multi-core runs.
+    """
+
+    def __init__(self, file, names):
+        self.file = file
+        self.names = names
+        self.quoted = {}
+
+    def write_events(self, events, end):
+        quoted = self.quoted
+        lines = []
+        for kind, time, process, arg, cpu in islice(events, end):
+            if kind == IDLE:
+                lines.append(f'{{"time": {time}, "event": "idle", "end": {arg}}}\n')
+                continue
+            name = quoted.get(process)
+            if name is None:
+                name = quoted[process] = json.dumps(self.names[process])
+            burst = f', "burst": {arg}' if kind == SELECTED else ''
+            on_cpu = f', "cpu": {cpu}' if cpu is not None else ''
+            lines.append(f'{{"time": {time}, "event": "{EVENT_KINDS[kind]}", "process": {name}{burst}{on_cpu}}}\n')
+        self.file.write(''.join(lines))
+
+class ColumnarEventWriter(EventWriter):
+    """Writes the events column by column into a binary .cols file.
+
+    Every batch becomes one block: the event count, then each column's raw
+    values. Writing costs no formatting at all, and read_event_columns() (or
+    numpy.frombuffer) loads a column without parsing.
+    """
+
+    def __init__(self, file, names):
+        self.file = file
+        self.names = names
+
+    def start(self):
+        metadata = json.dumps({'names': list(self.names), 'columns': EVENT_COLUMNS, 'kinds': EVENT_KINDS}).encode()
+        self.file.write(EVENTS_HEADER.pack(EVENTS_MAGIC, EVENTS_VERSION, BYTE_ORDER_MARK, len(metadata)))
+        self.file.write(metadata)
+
+    def write_events(self, events, end):
+        kinds, times, processes, args, cpus = zip(*islice(events, end))
+        cpus = [-1 if cpu is None else cpu for cpu in cpus]
+        self.file.write(struct.pack('=q', end))
+        for (_, typecode), column in zip(EVENT_COLUMNS, (kinds, times, processes, args, cpus)):
+            array(typecode, column).tofile(self.file)
+
+def read_event_columns(path):
+    """Load a .cols event dump; return (process names, {column name: array})."""
+    with open(path, 'rb') as f:
+        magic, version, byte_order, metadata_length = EVENTS_HEADER.unpack(f.read(EVENTS_HEADER.size))
+        if magic != EVENTS_MAGIC or version != EVENTS_VERSION or byte_order != BYTE_ORDER_MARK:
+            raise ValueError(f"{path} is not an event dump this version can read")
+        metadata = json.loads(f.read(metadata_length))
+        columns = {name: array(typecode) for name, typecode in metadata['columns']}
+        while True:
+            block = f.read(8)
+            if not block:
+                break
+            count, = struct.unpack('=q', block)
+            for column in columns.values():
+                column.fromfile(f, count)
+    return metadata['names'], columns
+
+# Machine-readable outputs for --emit: suffix of the file next to the .out file,
+# whether it is binary, and the event consumer that writes it (None for the metrics
+# CSV, which is written from the process table after the run)
+EMIT_FORMATS = {
+    'jsonl': ('.jsonl', False, JsonlEventWriter),
+    'csv': ('.csv', False, None),
+    'columnar': ('.cols', True, ColumnarEventWriter),
+}
+
+def write_metrics_csv(f, processes):
+    """Write one CSV row of metrics per process, sorted by name like the .out results."""
+    writer = csv.writer(f)
+    writer.writerow(('name', 'arrival', 'burst', 'finished', 'wait', 'turnaround', 'response'))
+    for process in sorted(range(len(processes)), key=processes.names.__getitem__):
+        if processes.completed[process]:
+            metrics = (1, processes.wait[process], processes.turnaround[process], processes.response[process])
+        else:
+            metrics = (0, '', '', '')
+        writer.writerow((processes.names[process], processes.arrival[process], processes.burst[process]) + metrics)
+
+class GanttRecorder:
+    """Event consumer that turns the events into run-length segments (process, start, end, core).
+
+    A segment opens when a process is selected onto a core and closes when that
+    core selects another process, the process finishes or is selected onto
+    another core, or the run ends (close()); nothing runs past `run_for`. A
+    process selected again right where its last segment on the core ended
+    extends that segment. With context-switch costs, a segment includes the
+    switch into it. Single-core runs use core 0.
+    """
+
+    def __init__(self, run_for):
+        self.run_for = run_for
+        self.process, self.start, self.end, self.core = (array('q') for _ in range(4))
+        self.open = {}    # Core -> (process, start) of the segment running on it
+        self.placed = {}  # Process -> core it has an open segment on
+        self.latest = {}  # Core -> index of its latest segment
+
+    def write_events(self, events, end):
+        close = self._close
+        for kind, time, process, _, cpu in islice(events, end):
+            if kind == SELECTED:
+                core = cpu or 0
+                close(core, time)
+                elsewhere = self.placed.get(process)
+                if elsewhere is not None:
+                    close(elsewhere, time)
+                self.open[core] = (process, time)
+                self.placed[process] = core
+            elif kind == FINISHED:
+                close(cpu or 0, time)
+
+    def _close(self, core, time):
+        opened = self.open.pop(core, None)
+        if opened is None:
+            return
+        process, start = opened
+        del self.placed[process]
+        time = min(time, self.run_for)
+        if time <= start:
+            return
+        latest = self.latest.get(core)
+        if latest is not None and self.end[latest] == start and self.process[latest] == process:
+            self.end[latest] = time
+            return
+        self.latest[core] = len(self.process)
+        self.process.append(process)
+        self.start.append(start)
+        self.end.append(time)
+        self.core.append(core)
+
+    def close(self):
+        """End the segments still open when the run stops."""
+        for core in list(self.open):
+            self._close(core, self.run_for)
+
+    def flush(self):
+        pass
+
+    def segments(self):
+        """The (process, start, end, core) segments, each core's in time order."""
+        return zip(self.process, self.start, self.end, self.core)
+
+def downsample_segments(segments, run_for, columns):
+    """Reduce `segments` to at most `columns` per core, for drawing at `columns` pixels wide.
+
+    Time is cut into `columns` equal columns. A segment keeps the columns it
+    covers completely, and a partly filled column goes to the process that ran
+    longest in it; neighbouring columns of one process merge again. Returns
+    (process, start, end, core) with fractional times on column boundaries.
+    Each core's segments must come in time order.
+    """
+    span = max(run_for, 1)  # Column c covers [c * span / columns, (c + 1) * span / columns)
+    by_core = {}
+    for segment in segments:
+        by_core.setdefault(segment[3], []).append(segment)
+
+    downsampled = []
+    for core, core_segments in sorted(by_core.items()):
+        runs = []  # [process, first column, end column]
+        def assign(process, first, last):
+            if runs and runs[-1][0] == process and runs[-1][2] == first:
+                runs[-1][2] = last
+            elif last > first:
+                runs.append([process, first, last])
+
+        column, shares = 0, {}  # Time each process ran in the column, in units of 1/columns
+        def settle():
+            if shares:
+                assign(max(shares, key=shares.get), column, column + 1)
+                shares.clear()
+
+        for process, start, end, _ in core_segments:
+            first, last = start * columns // span, end * columns // span
+            if first != column:
+                settle()
+                column = first
+            if first == last:
+                shares[process] = shares.get(process, 0) + (end - start) * columns
+                continue
+            shares[process] = shares.get(process, 0) + (first + 1) * span - start * columns
+            settle()
+            assign(process, first + 1, last)
+            column = last
+            if end * columns > last * span:
+                shares[process] = end * columns - last * span
+        settle()
+        downsampled.extend((process, first * span / columns, last * span / columns, core) for process, first, last in runs)
+    return downsampled
+
+def gantt_svg(segments, names, run_for, cores, width=1200, row_height=24):
+    """A self-contained SVG Gantt chart of `segments`, one row per core, downsampled to `width` pixels."""
+    left, top, axis = 60, 10, 30
+    scale = width / max(run_for, 1)
+    if run_for > width:
+        segments = downsample_segments(segments, run_for, width)
+    height = top + cores * row_height + axis
+    parts = [f'<svg xmlns="http://www.w3.org/2000/svg" width="{left + width + 20}" height="{height}" '
+             f'font-family="sans-serif" font-size="12">']
+
+    for core in range(cores):
+        y = top + core * row_height
+        parts.append(f'<text x="{left - 8}" y="{y + row_height * 0.65:.1f}" text-anchor="end">CPU {core}</text>')
+        parts.append(f'<rect x="{left}" y="{y}" width="{width}" height="{row_height - 2}" fill="#f4f4f4"/>')
+    for process, start, end, core in segments:
+        name = html.escape(names[process])
+        parts.append(f'<rect x="{left + start * scale:.2f}" y="{top + core * row_height}" '
+                     f'width="{(end - start) * scale:.2f}" height="{row_height - 2}" '
+                     f'fill="hsl({process * 137.508 % 360:.0f},60%,60%)">'
+                     f'<title>{name} {start:g}-{end:g}</title></rect>')
+
+    # Time axis, ticked at a round step giving about ten ticks
+    y = top + cores * row_height
+    parts.append(f'<line x1="{left}" y1="{y}" x2="{left + width}" y2="{y}" stroke="black"/>')
+    magnitude = 1
+    while magnitude * 100 < run_for:
+        magnitude *= 10
+    step = next(size * magnitude for size in (1, 2, 5, 10) if size * magnitude * 10 >= run_for)
+    for tick in range(0, run_for + 1, step):
+        x = left + tick * scale
+        parts.append(f'<line x1="{x:.2f}" y1="{y}" x2="{x:.2f}" y2="{y + 5}" stroke="black"/>')
+        parts.append(f'<text x="{x:.2f}" y="{y + 18}" text-anchor="middle">{tick}</text>')
+    parts.append('</svg>')
+    return '\n'.join(parts) + '\n'
+
+def write_gantt(path, recorder, names, run_for, cores, title, width=1200):
+    """Write the segments of `recorder` to `path`: an SVG or HTML chart, or every segment as CSV."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.csv':
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(('process', 'start', 'end', 'core'))
+            writer.writerows((names[process], start, end, core) for process, start, end, core in recorder.segments())
+        return
+
+    svg = gantt_svg(recorder.segments(), names, run_for, cores, width)
+    with open(path, 'w') as f:
+        if extension == '.svg':
+            f.write(svg)
         else:
-            # If no process is in the queue, the CPU is idle
-            timeline.append(f"Time {time}: Idle")
-            time += 1
+            f.write(f'<!DOCTYPE html>\n<html>\n<head><meta charset="utf-8"><title>{html.escape(title)}</title></head>\n'
+                    f'<body>\n<h1>{html.escape(title)}</h1>\n{svg}</body>\n</html>\n')
+
+class Checkpointer:
+    """Periodically saves a running simulation to `path` so that --resume can continue it.
+
+    The loop calls due() once per iteration and, when it returns True, save()
+    with its own state. A checkpoint holds the process table's per-run columns,
+    the policy (ready queue and all), the arrival cursor, the loop state, the
+    offsets the output `files` had reached and the state of the `collectors`.
+    The workload columns (names, arrivals, bursts) are not written: they are
+    pickled as references and bound to the table reloaded from the .in file on
+    resume. Checking the wall clock only every `check_every` iterations keeps
+    due() cheap.
+    """
+
+    def __init__(self, path, processes, source, interval=60.0, check_every=4096):
+        self.path = path
+        self.processes = processes
+        self.source = source  # Identifies the input and settings the checkpoint belongs to
+        self.interval = interval
+        self.check_every = check_every
+        self.countdown = check_every
+        self.last_save = perf_counter()
+        self.files = []     # Output files whose offsets a checkpoint records
+        self.collectors = {}  # Event consumers whose state a checkpoint keeps, by name
+        self.restored = None
+
+    def due(self):
+        self.countdown -= 1
+        if self.countdown:
+            return False
+        self.countdown = self.check_every
+        return perf_counter() - self.last_save >= self.interval
+
+    def save(self, policy, arrivals, state, timeline):
+        """Write a checkpoint of the loop `state` atomically, after flushing the timeline to its files."""
+        timeline.flush()
+        for file in self.files:
+            file.flush()
+        processes = self.processes
+        checkpoint = {
+            'source': self.source,
+            'offsets': [file.tell() for file in self.files],
+            'columns': (processes.remaining, processes.wait, processes.turnaround, processes.response,
+                        processes.completed),
+            'policy': policy,
+            'arrivals': arrivals,
+            'state': state,
+            'collectors': self.collectors,
+        }
+        temporary = self.path + '.tmp'
+        with open(temporary, 'wb') as f:
+            self._pickler(f).dump(checkpoint)
+        os.replace(temporary, self.path)
+        self.last_save = perf_counter()
+
+    def restore(self):
+        """Load the checkpoint into the process table and return the output file offsets to continue from.
+
+        Returns None if there is no checkpoint for this input and these settings.
+        """
+        try:
+            with open(self.path, 'rb') as f:
+                checkpoint = self._unpickler(f).load()
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+        if checkpoint['source'] != self.source:
+            return None
+
+        processes = self.processes
+        (processes.remaining, processes.wait, processes.turnaround, processes.response,
+         processes.completed) = checkpoint['columns']
+        self.restored = checkpoint
+        return checkpoint['offsets']
+
+    def discard(self):
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(self.path)
+
+    def _shared(self):
+        processes = self.processes
+        return {'table': processes, 'names': processes.names, 'arrival': processes.arrival, 'burst': processes.burst}
+
+    def _pickler(self, f):
+        shared = {id(obj): key for key, obj in self._shared().items()}
+        pickler = pickle.Pickler(f, pickle.HIGHEST_PROTOCOL)
+        pickler.persistent_id = lambda obj: shared.get(id(obj))
+        return pickler
+
+    def _unpickler(self, f):
+        unpickler = pickle.Unpickler(f)
+        unpickler.persistent_load = self._shared().__getitem__
+        return unpickler
+
+class PhaseProfiler:
+    """Cumulative wall time and call count per phase of a run, for --profile.
+
+    Top-level phases are timed with phase(); work inside the simulation loop is
+    timed by handing the loop a TimedPolicy and swapping the event consumers'
+    write_events for timed() wrappers before the run starts. Nothing is wrapped
+    unless a profiler is given, so an unprofiled run pays nothing. Each timed call
+    adds two perf_counter() reads, which show up in the phase that owns the call.
+    """
+
+    def __init__(self):
+        self.phases = {}  # Phase -> [seconds, calls, parent phase or None]
+
+    def _entry(self, name, parent=None):
+        return self.phases.setdefault(name, [0.0, 0, parent])
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        entry = self._entry(name)
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            entry[0] += perf_counter() - start
+            entry[1] += 1
+
+    def timed(self, name, function, parent='simulate'):
+        """`function` wrapped to add each call to phase `name`, which is part of `parent`."""
+        entry = self._entry(name, parent)
+
+        def timed_call(*args):
+            start = perf_counter()
+            try:
+                return function(*args)
+            finally:
+                entry[0] += perf_counter() - start
+                entry[1] += 1
+        return timed_call
+
+    def instrument_consumers(self, consumers):
+        for consumer in consumers:
+            consumer.write_events = self.timed(f"format ({type(consumer).__name__})", consumer.write_events)
+
+    def report(self, out, total):
+        """Print the breakdown table; `total` is the wall time of the whole run."""
+        out.write(f"{'phase':<34} {'calls':>10} {'seconds':>10} {'share':>7}\n")
+        children = {}
+        for name, (_, _, parent) in self.phases.items():
+            children.setdefault(parent, []).append(name)
+
+        def row(label, seconds, calls=''):
+            out.write(f"{label:<34} {calls:>10} {seconds:>10.4f} {percent(seconds, total):>7}\n")
+
+        accounted = 0.0
+        for name in children.get(None, ()):
+            seconds, calls, _ = self.phases[name]
+            accounted += seconds
+            row(name, seconds, calls)
+            nested = [child for child in children.get(name, ()) if self.phases[child][1]]
+            for child in nested:
+                row(f"  {child}", self.phases[child][0], self.phases[child][1])
+            if nested:
+                row("  loop and bookkeeping", seconds - sum(self.phases[child][0] for child in nested))
+        row("other", total - accounted)
+        row("total", total)
+
+class TimedPolicy:
+    """Stands in for `policy` in the simulation loop, timing its hooks on `profiler`.
+
+    Only the loop's calls are timed; the policy calling its own hooks (Round-Robin
+    requeueing through admit) is not counted twice.
+    """
+
+    def __init__(self, policy, profiler):
+        self.policy = policy
+        self.admit = profiler.timed('admit', policy.admit)
+        self.pick_next = profiler.timed('select', policy.pick_next)
+        self.preempt = profiler.timed('preempt', policy.preempt)
+        self.on_slice = profiler.timed('requeue', policy.on_slice)
+        self.on_complete = profiler.timed('complete', policy.on_complete)
+
+    def __getattr__(self, name):
+        return getattr(self.policy, name)
+
+def profile_phase(profiler, name):
+    """Time phase `name` on `profiler`, or do nothing without one."""
+    return profiler.phase(name) if profiler is not None else contextlib.nullcontext()
+
+class SchedulingPolicy:
+    """Base class of the scheduling algorithms that `simulate` runs.
+
+    The shared loop owns the clock, the arrivals, the bookkeeping and the
+    timeline; a policy only holds the ready processes and decides which one runs
+    next. Subclasses become `use <name>` in .in files through @register_scheduler.
+    """
+
+    name = None            # The `use` keyword
+    title = None           # The algorithm's name in the .out header
+    needs_quantum = False  # Whether the .in file must give a quantum
+    directives = ()        # Option directives the policy reads from the .in file
+    preemptive = False     # Whether preempt() is asked on every arrival while a process runs
+    time_sliced = False    # Whether processes run in whole slices of slice_length()
+
+    def __init__(self, processes, quantum=None, options=None):
+        self.processes = processes
+        self.quantum = quantum
+        self.options = options or {}
+
+    @classmethod
+    def check_parameters(cls, quantum, options):
+        """An error message if the policy cannot run with this quantum and these options, else None."""
+        if cls.needs_quantum and quantum is None:
+            return f"Missing quantum parameter when use is '{cls.name}'"
+        if cls.needs_quantum and quantum < 1:
+            return f"quantum must be at least 1 when use is '{cls.name}'"
+        return None
+
+    @classmethod
+    def header_lines(cls, quantum, options):
+        """The lines describing the policy's settings in the .out header."""
+        return [f"Quantum {quantum}"] if cls.needs_quantum else []
 
-    return timeline
+    def admit(self, process):
+        """`process` is ready to run."""
+        raise NotImplementedError
 
-def fcfs_scheduling(processes, run_for):
+    def pick_next(self, time):
+        """Remove and return the process to run at `time`, or None if none is ready."""
+        raise NotImplementedError
+
+    def preempt(self, running):
+        """The process that should take over from `running`, which the policy then holds again, or None."""
+        return None
+
+    def slice_length(self, process):
+        """How long `process` may run once selected (time-sliced policies only)."""
+        return self.quantum
+
+    def on_slice(self, process):
+        """`process` used up its slice without finishing."""
+        self.admit(process)
+
+    def on_complete(self, process, time):
+        """`process` finished at `time`."""
+
+SCHEDULERS = {}
+
+def register_scheduler(policy):
+    """Class decorator that makes `policy` available as `use <policy.name>`."""
+    SCHEDULERS[policy.name] = policy
+    OPTION_DIRECTIVES.update(policy.directives)
+    return policy
+
+@register_scheduler
+class FirstComeFirstServed(SchedulingPolicy):
     """First-Come, First-Served (FCFS) scheduling."""
+
+    name = 'fcfs'
+    title = "First-Come First-Served"
+
+    def __init__(self, processes, quantum=None, options=None):
+        super().__init__(processes, quantum, options)
+        self.ready_queue = deque()
+
+    def admit(self, process):
+        self.ready_queue.append(process)
+
+    def pick_next(self, time):
+        if self.ready_queue:
+            return self.ready_queue.popleft()
+        return None
+
+@register_scheduler
+class RoundRobin(FirstComeFirstServed):
+    """Round-Robin: FCFS order, but each selection only runs for one quantum."""
+
+    name = 'rr'
+    title = "Round-Robin"
+    needs_quantum = True
+    time_sliced = True
+
+@register_scheduler
+class ShortestJobFirst(SchedulingPolicy):
+    """Preemptive Shortest Job First (SJF) scheduling.
+
+    Waiting processes sit in a heap keyed on (remaining time, arrival order), so
+    selection and preemption checks cost O(log N). The running process is kept
+    out of the heap, so it keeps its arrival order to go back in with when
+    preempted; ties go to the earliest arrival, then to input order.
+    """
+
+    name = 'sjf'
+    title = "preemptive Shortest Job First"
+    preemptive = True
+
+    def __init__(self, processes, quantum=None, options=None):
+        super().__init__(processes, quantum, options)
+        self.ready_queue = []  # Heap of (remaining_time, arrival order, process)
+        self.arrivals = 0  # Processes admitted so far, which gives the arrival order
+        self.order = array('q', bytes(8 * len(processes)))  # Arrival order of each admitted process
+        self.remaining = processes.remaining
+
+    def admit(self, process):
+        order = self.order[process] = self.arrivals
+        self.arrivals += 1
+        heappush(self.ready_queue, (self.remaining[process], order, process))
+
+    def pick_next(self, time):
+        if self.ready_queue:
+            return heappop(self.ready_queue)[2]
+        return None
+
+    def preempt(self, running):
+        # Preempt the running process only if a strictly shorter job is waiting
+        ready_queue, remaining = self.ready_queue, self.remaining[running]
+        if ready_queue and ready_queue[0][0] < remaining:
+            return heapreplace(ready_queue, (remaining, self.order[running], running))[2]
+        return None
+
+@register_scheduler
+class NonPreemptiveShortestJobFirst(SchedulingPolicy):
+    """Non-preemptive Shortest Job First: the shortest waiting burst runs next, to completion.
+
+    Waiting processes sit in a heap keyed on (burst, arrival order).
+    """
+
+    name = 'sjf-np'
+    title = "non-preemptive Shortest Job First"
+
+    def __init__(self, processes, quantum=None, options=None):
+        super().__init__(processes, quantum, options)
+        self.ready_queue = []  # Heap of (burst, arrival order, process)
+        self.arrivals = 0  # Processes admitted so far, which gives the arrival order
+        self.burst = processes.burst
+
+    def admit(self, process):
+        heappush(self.ready_queue, (self.burst[process], self.arrivals, process))
+        self.arrivals += 1
+
+    def pick_next(self, time):
+        if self.ready_queue:
+            return heappop(self.ready_queue)[2]
+        return None
+
+class KineticTournament:
+    """Tournament tree that keeps the process with the highest response ratio on top as time advances.
+
+    A waiting process's response ratio (wait + burst) / burst grows linearly with
+    time, so the order of two processes changes at most once, and processes with
+    the same burst never change order at all. Those wait in one FIFO per burst,
+    and only the head of each FIFO is a leaf of the tree. Every internal node
+    keeps the winner of its subtree at the current time and the earliest time
+    that winner can change (the moment the loser overtakes it, or an earlier
+    change further down). Advancing the clock only revisits nodes whose
+    certificate has expired, and a new head recomputes one leaf-to-root path,
+    stopping early once a node comes out unchanged. Freed leaves are reused and
+    the tree doubles when full, so its depth follows the number of distinct
+    waiting bursts rather than the whole workload. Ratios are compared exactly
+    with integer cross-multiplication; ties go to the earlier arrival.
+    """
+
+    def __init__(self, processes):
+        self.arrival = processes.arrival
+        self.burst = processes.burst
+        self.order = array('q', bytes(8 * len(processes)))  # Arrival order of each waiting process
+        self.queues = {}  # Burst -> FIFO of the waiting processes with that burst
+        self.leaf = {}    # Burst -> tree node holding the head of its FIFO
+        self.arrivals = 0
+        self.now = 0
+        self._allocate(4)
+
+    def _allocate(self, size):
+        self.size = size
+        self.winner = array('q', [-1]) * (2 * size)  # Process on top of each subtree, -1 if empty
+        self.expires = array('q', [NEVER]) * (2 * size)
+        self.free = list(range(2 * size - 1, size - 1, -1))  # Unused leaves, lowest last
+
+    def __bool__(self):
+        return self.winner[1] != -1
+
+    def insert(self, process):
+        self.order[process] = self.arrivals
+        self.arrivals += 1
+        burst = self.burst[process]
+        queue = self.queues.get(burst)
+        if queue:
+            queue.append(process)  # Behind an earlier arrival with the same burst
+            return
+
+        if not self.free:
+            self._grow()
+        node = self.free.pop()
+        self.queues[burst] = deque((process,))
+        self.leaf[burst] = node
+        self.winner[node] = process
+        self._update_path(node)
+
+    def pop(self, time):
+        """Remove and return the process with the highest response ratio at `time`."""
+        self.advance(time)
+        process = self.winner[1]
+        burst = self.burst[process]
+        queue = self.queues[burst]
+        queue.popleft()
+        node = self.leaf[burst]
+        if queue:
+            self.winner[node] = queue[0]
+        else:
+            del self.queues[burst], self.leaf[burst]
+            self.winner[node] = -1
+            self.free.append(node)
+        self._update_path(node)
+        return process
+
+    def advance(self, time):
+        """Move the clock to `time`, replaying every overtake that has happened since."""
+        self.now = time
+        if self.expires[1] <= time:
+            self._refresh(1)
+
+    def _grow(self):
+        waiting = [process for process in self.winner[self.size:] if process != -1]
+        self._allocate(2 * self.size)
+        for node, process in enumerate(waiting, self.size):
+            self.winner[node] = process
+            self.leaf[self.burst[process]] = node
+        del self.free[len(self.free) - len(waiting):]
+        for node in range(self.size - 1, 0, -1):
+            self._match(node)
+
+    def _refresh(self, node):
+        if self.expires[node] > self.now or node >= self.size:
+            return
+        self._refresh(2 * node)
+        self._refresh(2 * node + 1)
+        self._match(node)
+
+    def _update_path(self, node):
+        winner, expires, match = self.winner, self.expires, self._match
+        node //= 2
+        while node:
+            top, certificate = winner[node], expires[node]
+            match(node)
+            if winner[node] == top and expires[node] == certificate:
+                break
+            node //= 2
+
+    def _match(self, node):
+        """Recompute `node`'s winner and certificate from its children at the current time."""
+        left, right = 2 * node, 2 * node + 1
+        winner, expires = self.winner, self.expires
+        a, b = winner[left], winner[right]
+        if b == -1 or a == -1:
+            child = right if a == -1 else left
+            winner[node], expires[node] = winner[child], expires[child]
+            return
+
+        # Compare (now - arrival) / burst, the part of the ratio that differs
+        now, arrival, burst, order = self.now, self.arrival, self.burst, self.order
+        lead = (now - arrival[a]) * burst[b] - (now - arrival[b]) * burst[a]
+        if lead < 0 or (lead == 0 and order[b] < order[a]):
+            a, b = b, a
+        winner[node] = a
+
+        # The loser overtakes only if its ratio grows faster, i.e. its burst is shorter
+        overtake = NEVER
+        gain = burst[a] - burst[b]
+        if gain > 0:
+            crossing = arrival[b] * burst[a] - arrival[a] * burst[b]  # At time crossing / gain
+            if order[b] < order[a]:
+                overtake = -(-crossing // gain)  # Wins the tie at the crossing itself
+            else:
+                overtake = crossing // gain + 1
+        expires[node] = min(overtake, expires[left], expires[right])
+
+@register_scheduler
+class HighestResponseRatioNext(SchedulingPolicy):
+    """Highest Response Ratio Next (HRRN): non-preemptive, runs the waiting process with
+    the highest (wait + burst) / burst, so short jobs go first but long ones age their way up."""
+
+    name = 'hrrn'
+    title = "Highest Response Ratio Next"
+
+    def __init__(self, processes, quantum=None, options=None):
+        super().__init__(processes, quantum, options)
+        self.ready = KineticTournament(processes)
+
+    def admit(self, process):
+        self.ready.insert(process)
+
+    def pick_next(self, time):
+        if self.ready:
+            return self.ready.pop(time)
+        return None
+
+@register_scheduler
+class MultilevelFeedbackQueue(SchedulingPolicy):
+    """Multilevel Feedback Queue (MLFQ) scheduling.
+
+    Each level is a Round-Robin queue with its own quantum: `quanta q0 q1 ...`
+    from the top level down, or else `levels` levels (3 by default) starting at
+    `quantum` and doubling at each level. New processes start at the top level
+    and drop a level each time they use up a whole slice; the highest non-empty
+    level always runs next. With `boost S`, every waiting process moves back to
+    the top level once every S time units. As with RR, a slice is never cut short.
+
+    A level is a deque of deque segments, so a boost moves whole segments onto
+    the top level in O(levels) however many processes are waiting, and every
+    other step is O(1) per level.
+    """
+
+    name = 'mlfq'
+    title = "Multilevel Feedback Queue"
+    directives = ('levels', 'quanta', 'boost')
+    time_sliced = True
+
+    def __init__(self, processes, quantum=None, options=None):
+        super().__init__(processes, quantum, options)
+        self.quanta = self.level_quanta(quantum, self.options)
+        self.boost = self.options.get('boost', (0,))[0]
+        self.next_boost = self.boost
+        self.levels = [deque([deque()]) for _ in self.quanta]  # Segments, oldest first
+        self.sizes = [0] * len(self.quanta)
+        self.level = bytearray(len(processes))  # Level each process was last taken from
+
+    @staticmethod
+    def level_quanta(quantum, options):
+        if 'quanta' in options:
+            return options['quanta']
+        return tuple(quantum << level for level in range(options.get('levels', (3,))[0]))
+
+    @classmethod
+    def check_parameters(cls, quantum, options):
+        if 'quanta' not in options and quantum is None:
+            return f"Missing quantum or quanta parameter when use is '{cls.name}'"
+        for directive in ('levels', 'boost'):
+            if directive in options and len(options[directive]) != 1:
+                return f"{directive} takes one value"
+        if not 1 <= options.get('levels', (3,))[0] <= 256:
+            return "MLFQ needs 1 to 256 levels and positive quanta"
+        if 'quanta' in options and 'levels' in options and options['levels'][0] != len(options['quanta']):
+            return f"quanta gives {len(options['quanta'])} values but levels is {options['levels'][0]}"
+        quanta = cls.level_quanta(quantum, options)
+        if not 1 <= len(quanta) <= 256 or min(quanta) < 1:
+            return "MLFQ needs 1 to 256 levels and positive quanta"
+        if options.get('boost', (0,))[0] < 0:
+            return "boost must not be negative"
+        return None
+
+    @classmethod
+    def header_lines(cls, quantum, options):
+        lines = [f"Quanta {' '.join(map(str, cls.level_quanta(quantum, options)))}"]
+        if options.get('boost', (0,))[0]:
+            lines.append(f"Boost every {options['boost'][0]}")
+        return lines
+
+    def admit(self, process):
+        self.levels[0][-1].append(process)
+        self.sizes[0] += 1
+
+    def pick_next(self, time):
+        if self.boost and time >= self.next_boost:
+            self.boost_all()
+            self.next_boost = (time // self.boost + 1) * self.boost
+
+        for level, size in enumerate(self.sizes):
+            if size:
+                segments = self.levels[level]
+                while not segments[0]:
+                    segments.popleft()
+                self.sizes[level] -= 1
+                process = segments[0].popleft()
+                self.level[process] = level
+                return process
+        return None
+
+    def slice_length(self, process):
+        return self.quanta[self.level[process]]
+
+    def on_slice(self, process):
+        # A process that used its whole slice drops a level
+        level = min(self.level[process] + 1, len(self.levels) - 1)
+        self.levels[level][-1].append(process)
+        self.sizes[level] += 1
+
+    def boost_all(self):
+        """Move every waiting process to the top level, keeping higher levels first."""
+        top = self.levels[0]
+        for level in range(1, len(self.levels)):
+            if self.sizes[level]:
+                top.extend(self.levels[level])
+                self.levels[level] = deque([deque()])
+                self.sizes[0] += self.sizes[level]
+                self.sizes[level] = 0
+
+def simulate(policy, run_for, timeline, checkpoint=None):
+    """Run `policy` over its process table until `run_for`, reporting every event to `timeline`.
+
+    Time jumps from event to event (an arrival, a completion, the end of a slice)
+    and idle stretches pass in one step. At any instant completions come before
+    arrivals, and arrivals before the next selection.
+
+    A time-sliced policy runs every selection for a whole slice, even past
+    `run_for`, and the processes arriving during the slice (its last instant
+    included) are admitted before the preempted process goes back to the policy.
+    Otherwise the running process runs until it finishes or something arrives,
+    and it only finishes if it does so by `run_for`.
+
+    With a `checkpoint` (a Checkpointer), the loop saves itself periodically, or
+    continues from the state the Checkpointer has restored.
+    """
+    processes = policy.processes
+    arrival, remaining, response = processes.arrival, processes.remaining, processes.response
+    arrivals = ArrivalIndex(processes)
+    admit, pick_next, preempt = policy.admit, policy.pick_next, policy.preempt
+    on_slice, on_complete, finish = policy.on_slice, policy.on_complete, processes.finish
+    arrived, selected_at, finished = timeline.arrived, timeline.selected, timeline.finished
+    preemptive, time_sliced = policy.preemptive, policy.time_sliced
     time = 0
-    timeline = []
-    process_queue = []
-    running_process = None
-    last_process = None  # JL: To track the last logged process, similar to other schedulers
+    running = None
+    if checkpoint is not None and checkpoint.restored:
+        arrivals = checkpoint.restored['arrivals']
+        time, running = checkpoint.restored['state']
 
-    processes.sort(key=lambda p: p.arrival_time)
-    
     while time < run_for:
-        # Check for arriving processes at the current time
-        for process in processes:
-            if process.arrival_time == time:
-                process_queue.append(process)
-                timeline.append(f"Time {time}: {process.name} arrived")
-
-        # If there's no running process and there are processes in the queue
-        if not running_process and process_queue:
-            running_process = process_queue.pop(0)
-            
-            # Set the response time if it's the first time the process is selected
-            if running_process.response_time == -1:
-                running_process.response_time = time - running_process.arrival_time
-            
-            # Log the process selection only if it's different from the last process
-            if last_process != running_process.name:
-                timeline.append(f"Time {time}: {running_process.name} selected (burst {running_process.remaining_time})")
-                last_process = running_process.name
-
-        if running_process:
-            # Process is running, execute it for 1 time unit
-            running_process.remaining_time -= 1
-            
-            # If the process finishes
-            if running_process.remaining_time == 0:
-                running_process.completed = True
-                running_process.turnaround_time = (time + 1) - running_process.arrival_time
-                running_process.wait_time = running_process.turnaround_time - running_process.burst_time
-                timeline.append(f"Time {time + 1}: {running_process.name} finished")
-                running_process = None
-                last_process = None  # Reset last process since the current one finished
+        if checkpoint is not None and checkpoint.due():
+            checkpoint.save(policy, arrivals, (time, running), timeline)
+
+        # Hand the processes that have arrived by now to the policy
+        admitted = arrivals.admit(time)
+        for process in admitted:
+            admit(process)
+            arrived(arrival[process], process)
+
+        # Select a process if the CPU is free, or let a preemptive policy switch on an arrival
+        if running is None:
+            selected = pick_next(time)
+        elif preemptive and admitted:
+            selected = preempt(running)
+        else:
+            selected = None
+
+        if selected is not None:
+            running = selected
+
+            # If the process is selected for the first time, set its response time
+            if response[running] == -1:
+                response[running] = time - arrival[running]
+
+            selected_at(time, running, remaining[running])
+
+        elif running is None:
+            # Nothing to run: skip straight to the next arrival
+            next_time = arrivals.next_arrival(run_for)
+            timeline.idle(time, next_time)
+            time = next_time
+            continue
+
+        if time_sliced:
+            # Run the process for its slice or for its remaining time, whichever is smaller
+            time_slice = min(policy.slice_length(running), remaining[running])
+            remaining[running] -= time_slice
+            time += time_slice
+
+            # Processes arriving during the slice queue ahead of the preempted process
+            for process in arrivals.admit(time):
+                admit(process)
+                arrived(arrival[process], process)
+
+            if remaining[running] == 0:
+                finish(running, time)
+                finished(time, running)
+                on_complete(running, time)
+            else:
+                on_slice(running)
+            running = None
+
         else:
-            # If no process is running, the CPU is idle
-            timeline.append(f"Time {time}: Idle")
-            last_process = None  # Reset last process during idle time
+            # The process runs until it finishes or until the next arrival, whichever is first
+            next_time = arrivals.next_arrival(run_for)
+            finish_time = time + remaining[running]
+            if finish_time <= next_time:
+                finish(running, finish_time)
+                finished(finish_time, running)
+                on_complete(running, finish_time)
+                running = None
+                next_time = finish_time
+            else:
+                remaining[running] -= next_time - time
+            time = next_time
+
+def simulate_cores(policy, run_for, timeline, cpus, switch_costs=None, checkpoint=None):
+    """`simulate` on `cpus` identical cores that share the policy's ready queue.
 
-        time += 1
+    Instants are handled in the same order as in `simulate` (with one core the
+    timeline comes out the same), and every core follows the same slice and
+    completion rules. Free cores take work lowest-numbered first; once none is
+    free, a preemptive policy is offered the process with the most work left.
+    Core events sit in a heap and free cores in another, so an event costs
+    O(log cpus) on top of the policy's own work. With more than one core,
+    selections and completions name their core and Idle is only logged while
+    every core is idle.
 
-    return timeline
+    With `switch_costs` (switch, resume), every dispatch first spends `switch`
+    time units switching, or `resume` if the core is resuming the process it
+    ran last; a slice or burst only starts counting down after that, and a
+    process preempted while being switched in loses the switch.
 
+    `checkpoint` works as in `simulate`.
+
+    Returns, for each core, the time it spent busy (switching included) and
+    switching before `run_for`, and the number of switches it made (None
+    without `switch_costs`).
+    """
+    processes = policy.processes
+    arrival, remaining, response = processes.arrival, processes.remaining, processes.response
+    arrivals = ArrivalIndex(processes)
+    admit, pick_next, preempt = policy.admit, policy.pick_next, policy.preempt
+    preemptive, time_sliced = policy.preemptive, policy.time_sliced
+
+    running = [-1] * cpus   # Process on each core
+    started = [0] * cpus    # When it was put there
+    switched = [0] * cpus   # When it was switched in and began to run
+    ends = [0] * cpus       # When its slice or burst ends
+    runs = [0] * cpus       # Bumped whenever a core's run ends, so stale heap entries can be told apart
+    last = [-1] * cpus      # Process each core ran last
+    busy = [0] * cpus
+    switching = [0] * cpus
+    switches = [0] * cpus
+    switch_cost, resume_cost = switch_costs or (0, 0)
+    free = list(range(cpus))  # Heap of idle cores
+    events = []   # Heap of (end, core, run)
+    longest = []  # Heap of (-end, core, run), for picking whom to preempt
+
+    def start(core, process, time):
+        running[core] = process
+        started[core] = time
+        if response[process] == -1:
+            response[process] = time - arrival[process]
+        timeline.selected(time, process, remaining[process], core if cpus > 1 else None)
+
+        if switch_costs is not None:
+            switched[core] = time + (resume_cost if last[core] == process else switch_cost)
+            last[core] = process
+            switches[core] += 1
+        else:
+            switched[core] = time
+        end = ends[core] = switched[core] + (min(policy.slice_length(process), remaining[process]) if time_sliced
+                                             else remaining[process])
+        heappush(events, (end, core, runs[core]))
+        if preemptive:
+            heappush(longest, (-end, core, runs[core]))
+
+    def release(core, time):
+        busy[core] += min(time, run_for) - started[core]
+        switching[core] += min(time, run_for, switched[core]) - started[core]
+        running[core] = -1
+        runs[core] += 1
+
+    def admit_arrivals(time):
+        admitted = arrivals.admit(time)
+        for process in admitted:
+            admit(process)
+            timeline.arrived(arrival[process], process)
+        return admitted
 
-def sjf_scheduling(processes, run_for):
-    """Preemptive Shortest Job First (SJF) scheduler with reduced redundant logging for processes."""
     time = 0
-    timeline = []
-    ready_queue = []
-    running_process = None
-    completed_processes = []
-    last_process = None  # To keep track of the last logged process (not idle)
+    state = (running, started, switched, ends, runs, last, busy, switching, switches, free, events, longest)
+    if checkpoint is not None and checkpoint.restored:
+        arrivals = checkpoint.restored['arrivals']
+        time, saved = checkpoint.restored['state']
+        for values, saved_values in zip(state, saved):
+            values[:] = saved_values
 
-    processes.sort(key=lambda p: p.arrival_time)
+    while True:
+        if checkpoint is not None and checkpoint.due():
+            checkpoint.save(policy, arrivals, (time, state), timeline)
 
-    while time < run_for:
-        # Check for newly arrived processes
-        for process in processes:
-            if process.arrival_time == time:
-                ready_queue.append(process)
-                timeline.append(f"Time {time}: {process.name} arrived")
-
-        # Remove finished processes from the ready queue
-        ready_queue = [p for p in ready_queue if p.remaining_time > 0]
-
-        if ready_queue:
-            # Select the process with the shortest remaining burst time
-            shortest_job = min(ready_queue, key=lambda p: p.remaining_time)
-
-            # Preempt the running process if a shorter job arrives or there's no running process
-            if running_process is None or shortest_job.remaining_time < running_process.remaining_time:
-                running_process = shortest_job
-
-            # If the process is selected for the first time, set response time
-            if running_process.response_time == -1:
-                running_process.response_time = time - running_process.arrival_time
-
-            # Log the process only if it's a different process from the last one
-            if last_process != running_process.name:
-                timeline.append(f"Time {time}: {running_process.name} selected (burst {running_process.remaining_time})")
-                last_process = running_process.name
-
-            # Execute the process for 1 time unit
-            running_process.remaining_time -= 1
-
-            # If the process completes, mark it as finished
-            if running_process.remaining_time == 0:
-                running_process.completed = True
-                running_process.turnaround_time = (time + 1) - running_process.arrival_time
-                running_process.wait_time = running_process.turnaround_time - running_process.burst_time
-                timeline.append(f"Time {time + 1}: {running_process.name} finished")
-                last_process = None  # Reset last_process as the current process finished
-                completed_processes.append(running_process)
-                running_process = None
+        # Slice ends see the arrivals of the same instant; completions come before them
+        admitted = admit_arrivals(time) if time_sliced else ()
+        while events and events[0][0] == time:
+            end, core, run = heappop(events)
+            if run != runs[core]:
+                continue
+            process = running[core]
+            release(core, time)
+            heappush(free, core)
+            if time_sliced:
+                remaining[process] -= end - switched[core]
+            else:
+                remaining[process] = 0
+            if remaining[process] == 0:
+                processes.finish(process, time)
+                timeline.finished(time, process, core if cpus > 1 else None)
+                policy.on_complete(process, time)
+            else:
+                policy.on_slice(process)
+        if not time_sliced and time < run_for:
+            admitted = admit_arrivals(time)
+
+        if time < run_for:
+            while free:
+                process = pick_next(time)
+                if process is None:
+                    break
+                start(heappop(free), process, time)
+
+            # With every core taken, newcomers may still displace the process with the most work left
+            while preemptive and admitted and not free and longest:
+                _, core, run = longest[0]
+                if run != runs[core]:
+                    heappop(longest)
+                    continue
+                remaining[running[core]] = ends[core] - max(time, switched[core])
+                replacement = preempt(running[core])
+                if replacement is None:
+                    break
+                heappop(longest)
+                release(core, time)
+                start(core, replacement, time)
+
+        # Drop stale events, then move to the next instant
+        while events and events[0][2] != runs[events[0][1]]:
+            heappop(events)
+        next_end = events[0][0] if events else NEVER
+        next_arrival = arrivals.next_arrival(NEVER)
+
+        if len(free) == cpus and time < run_for:
+            timeline.idle(time, min(next_arrival, run_for))
+
+        if time_sliced:
+            # Slices already started always run to their end
+            if not events and next_arrival >= run_for:
+                break
+            time = min(next_end, next_arrival)
+        elif next_end <= run_for and next_end <= next_arrival:
+            time = next_end
+        elif next_arrival < run_for:
+            time = next_arrival
         else:
-            # No process is ready, the CPU is idle
-            timeline.append(f"Time {time}: Idle")
-            last_process = None  # Reset last_process because we're in idle state
+            break
 
-        time += 1
+    # Processes still on a core at the end keep whatever work they had left
+    for core, process in enumerate(running):
+        if process != -1:
+            if not time_sliced:
+                remaining[process] = ends[core] - max(run_for, switched[core])
+            release(core, run_for)
+    return busy, switching, switches if switch_costs is not None else None
 
-    return timeline
+def run_scheduler(scheduling_algo, processes, run_for, quantum, timeline, options=None, checkpoint=None, profiler=None):
+    """Simulate `processes` under the registered scheduler `scheduling_algo`.
 
+    With a `checkpoint` that has restored a saved run, the saved policy carries on
+    instead. With a `profiler`, the policy's hooks are timed.
 
-def print_to_output_file(process_count, scheduling_algo, run_for, quantum, processes, timeline, output_file):
-    # Determine the name of the scheduling algorithm
-    if scheduling_algo == 'fcfs':
-        scheduling_algo_name = "First-Come First-Served"
-    elif scheduling_algo == 'sjf':
-        scheduling_algo_name = "preemptive Shortest Job First"
-    elif scheduling_algo == 'rr':
-        scheduling_algo_name = "Round-Robin"
+    Returns simulate_cores' per-core usage when the options ask for more than one
+    CPU or for context-switch costs, else None.
+    """
+    options = options or {}
+    if checkpoint is not None and checkpoint.restored:
+        policy = checkpoint.restored['policy']
     else:
-        scheduling_algo_name = scheduling_algo  # Fallback, just print the given name if not one of the known ones
+        policy = SCHEDULERS[scheduling_algo](processes, quantum, options)
+    if profiler is not None:
+        policy = TimedPolicy(policy, profiler)
+    cpus = options.get('cpus', (1,))[0]
+    if cpus > 1 or 'contextswitch' in options:
+        switch_costs = context_switch_costs(options) if 'contextswitch' in options else None
+        return simulate_cores(policy, run_for, timeline, cpus, switch_costs, checkpoint)
+    simulate(policy, run_for, timeline, checkpoint)
+    return None
 
-    with open(output_file, 'w') as f:
-        # Print the summary header
-        f.write(f"{process_count} processes\n")
-        f.write(f"Using {scheduling_algo_name}\n") # JL: modified print statement to match the above conditional check.
-        
-        if scheduling_algo == 'rr':
-            f.write(f"Quantum {quantum}\n")
+def context_switch_costs(options):
+    """(switch cost, same-process resume cost) from `contextswitch C [S]`; S defaults to C."""
+    costs = options.get('contextswitch', (0,))
+    return costs[0], costs[1] if len(costs) > 1 else costs[0]
 
-        f.write('\n')
-        
-        # Print the timeline (arrival, selected, finished, idle)
-        for event in timeline:
-            f.write(event + '\n')
+def expand_compact_output(compact_file, out):
+    """Copy a `--compact` .out file to `out`, expanding ranged Idle lines to one line per tick."""
+    with open(compact_file, 'r') as f:
+        for line in f:
+            idle_range = IDLE_RANGE.match(line)
+            if idle_range:
+                start, last = int(idle_range.group(1)), int(idle_range.group(2))
+                out.write(''.join(f"Time {t}: Idle\n" for t in range(start, last + 1)))
+            else:
+                out.write(line)
 
-        # Print when the simulation finishes
-        f.write(f"Finished at time {run_for}\n")
+def print_output_header(f, process_count, scheduling_algo, quantum, options=None):
+    # Determine the name of the scheduling algorithm
+    policy = SCHEDULERS.get(scheduling_algo)
+    scheduling_algo_name = policy.title if policy else scheduling_algo  # Fallback, just print the given name
 
-        # JL: Print newline.
-        f.write('\n')
+    # Print the summary header
+    f.write(f"{process_count} processes\n")
+    f.write(f"Using {scheduling_algo_name}\n")
 
-        # Print each process's wait, turnaround, and response times
-        processes.sort(key=lambda p: p.name)
-        for process in processes:
-            if process.completed:
-                f.write(f"{process.name} wait \t{process.wait_time} "
-                        f"turnaround \t{process.turnaround_time} "
-                        f"response \t{process.response_time}\n")
-            else:
-                f.write(f"{process.name} did not finish\n")
+    if policy is not None:
+        for line in policy.header_lines(quantum, options or {}):
+            f.write(f"{line}\n")
+    cpus = (options or {}).get('cpus', (1,))[0]
+    if cpus > 1:
+        f.write(f"{cpus} CPUs\n")
+    if 'contextswitch' in (options or {}):
+        switch_cost, resume_cost = context_switch_costs(options)
+        f.write(f"Context switch {switch_cost} (same process {resume_cost})\n")
+
+    f.write('\n')
+
+def print_output_results(f, run_for, processes, usage=None):
+    # Print when the simulation finishes
+    f.write(f"Finished at time {run_for}\n")
+    f.write('\n')
+
+    # Print each process's wait, turnaround, and response times, sorted by name
+    for process in sorted(range(len(processes)), key=processes.names.__getitem__):
+        if processes.completed[process]:
+            f.write(f"{processes.names[process]} wait \t{processes.wait[process]} "
+                    f"turnaround \t{processes.turnaround[process]} "
+                    f"response \t{processes.response[process]}\n")
+        else:
+            f.write(f"{processes.names[process]} did not finish\n")
+
+    if usage is None:
+        return
+
+    # Per-core utilization, for multi-core runs
+    busy, switching, switches = usage
+    f.write('\n')
+    if len(busy) > 1:
+        for cpu, busy_time in enumerate(busy):
+            f.write(f"CPU {cpu} busy {busy_time} of {run_for} ({percent(busy_time, run_for)})\n")
+
+    # Context-switch overhead, and the share of CPU time left for the processes themselves
+    if switches is not None:
+        capacity = run_for * len(busy)
+        useful = sum(busy) - sum(switching)
+        f.write(f"Context switches {sum(switches)}, overhead {sum(switching)} ({percent(sum(switching), capacity)})\n")
+        f.write(f"Effective CPU utilization {percent(useful, capacity)} ({useful} of {capacity})\n")
+
+def percent(part, whole):
+    return f"{100 * part / whole if whole else 0:.1f}%"
+
+def simulate_file(input_file, output_file, compact=False, use_cache=True, checkpoint_interval=None, resume=False,
+                  summary=False, emit=(), metrics_only=False, gantt=None, gantt_width=1200, profiler=None):
+    """Load `input_file`, run the scheduler it asks for and write the results to `output_file`.
+
+    With `checkpoint_interval` (seconds) or `resume`, the run is checkpointed to
+    a .ckpt file next to `output_file`; with `resume`, a checkpoint left there by
+    an interrupted run of the same input and settings is continued instead of
+    starting over. The checkpoint is removed once the run completes.
+
+    With `summary`, aggregate statistics are gathered as processes finish and
+    written after the per-process results. Each EMIT_FORMATS name in `emit`
+    also writes that machine-readable output next to `output_file`. With
+    `metrics_only`, the timeline is left out of the .out file and no event is
+    recorded unless the summary or the chart needs it. `gantt` names a file to
+    write the schedule to (see write_gantt), drawn `gantt_width` pixels wide.
+    A PhaseProfiler `profiler` times each phase of the run; it cannot be combined
+    with checkpoints, since the timed hooks do not pickle.
+    """
+    with profile_phase(profiler, 'parse'):
+        process_count, run_for, scheduling_algo, quantum, options, processes = load_workload(input_file, use_cache)
+    stem = os.path.splitext(output_file)[0]
+    event_formats = [name for name in EMIT_FORMATS if name in emit and EMIT_FORMATS[name][2] is not None]
+
+    checkpoint = None
+    offsets = None
+    if checkpoint_interval is not None or resume:
+        source_stat = os.stat(input_file)
+        checkpoint = Checkpointer(stem + '.ckpt', processes,
+                                  (source_stat.st_mtime_ns, source_stat.st_size, compact, summary, tuple(event_formats),
+                                   metrics_only, gantt is not None),
+                                  60.0 if checkpoint_interval is None else checkpoint_interval)
+        if resume:
+            offsets = checkpoint.restore()
+            if offsets is None:
+                print(f"No checkpoint of {input_file} to resume, starting from time 0")
+
+    # The timeline and the event outputs are streamed into their files while the simulation runs
+    with contextlib.ExitStack() as stack:
+        f = stack.enter_context(open(output_file, 'w' if offsets is None else 'r+'))
+        files = [f]
+        consumers = [] if metrics_only else [TimelineWriter(f, processes.names, compact=compact)]
+        writers = []
+        for name in event_formats:
+            suffix, binary, writer = EMIT_FORMATS[name]
+            mode = ('w' if offsets is None else 'r+') + ('b' if binary else '')
+            files.append(stack.enter_context(open(stem + suffix, mode)))
+            writers.append(writer(files[-1], processes.names))
+        consumers += writers
+
+        if offsets is None:
+            print_output_header(f, process_count, scheduling_algo, quantum, options)
+            for writer in writers:
+                writer.start()
+        else:
+            # Drop whatever the interrupted run wrote after its checkpoint
+            for file, offset in zip(files, offsets):
+                file.seek(offset)
+                file.truncate()
+
+        collectors = checkpoint.restored['collectors'] if checkpoint is not None and checkpoint.restored else {}
+        if summary:
+            collectors.setdefault('summary', SummarySink(processes, RunSummary()))
+        if gantt is not None:
+            collectors.setdefault('gantt', GanttRecorder(run_for))
+        consumers += collectors.values()
+        if checkpoint is not None:
+            checkpoint.files = files
+            checkpoint.collectors = collectors
+        if profiler is not None:
+            profiler.instrument_consumers(consumers)
+        timeline = EventBuffer(consumers) if consumers else NullTimeline()
+
+        # Run the chosen scheduling algorithm
+        with profile_phase(profiler, 'simulate'):
+            usage = run_scheduler(scheduling_algo, processes, run_for, quantum, timeline, options, checkpoint, profiler)
+            timeline.flush()
+
+        with profile_phase(profiler, 'write results'):
+            print_output_results(f, run_for, processes, usage)
+            if summary:
+                collectors['summary'].summary.write(f, run_for, len(processes), usage)
+
+    if gantt is not None:
+        with profile_phase(profiler, 'gantt'):
+            recorder = collectors['gantt']
+            recorder.close()
+            write_gantt(gantt, recorder, processes.names, run_for, options.get('cpus', (1,))[0],
+                        f"{os.path.basename(input_file)}: {SCHEDULERS[scheduling_algo].title}", gantt_width)
+
+    if 'csv' in emit:
+        with profile_phase(profiler, 'metrics csv'), open(stem + EMIT_FORMATS['csv'][0], 'w', newline='') as metrics:
+            write_metrics_csv(metrics, processes)
+
+    if checkpoint is not None:
+        checkpoint.discard()
+
+def output_path(input_file, output_dir=None):
+    """The .out file for `input_file`: next to it, or in `output_dir` when one is given."""
+    output_file = os.path.splitext(input_file)[0] + '.out'
+    if output_dir is not None:
+        output_file = os.path.join(output_dir, os.path.basename(output_file))
+    return output_file
+
+def run_batch_file(input_file, output_dir, expected_dir, compact, use_cache):
+    """Simulate one input of a batch and return (passed, seconds, detail)."""
+    output_file = output_path(input_file, output_dir)
+    messages = io.StringIO()
+    start = perf_counter()
+    try:
+        with contextlib.redirect_stdout(messages):
+            simulate_file(input_file, output_file, compact, use_cache)
+    except SystemExit:
+        # parse_input_file prints its error and exits
+        return False, perf_counter() - start, messages.getvalue().strip()
+    except Exception as e:
+        return False, perf_counter() - start, f"{type(e).__name__}: {e}"
+    elapsed = perf_counter() - start
+
+    if expected_dir is None:
+        return True, elapsed, ''
+    expected_file = os.path.join(expected_dir, os.path.basename(output_file))
+    if not os.path.exists(expected_file):
+        return True, elapsed, 'no expected output'
+    if filecmp.cmp(output_file, expected_file, shallow=False):
+        return True, elapsed, 'matches expected output'
+    return False, elapsed, f"differs from {expected_file}"
+
+def run_batch(pattern, output_dir=None, expected_dir=None, compact=False, jobs=None, use_cache=True):
+    """Simulate every .in file matched by `pattern` (a directory or a glob) across a process pool.
+
+    Prints a pass/fail and wall time row per file and returns whether every file passed.
+    """
+    if os.path.isdir(pattern):
+        pattern = os.path.join(pattern, '*.in')
+    input_files = sorted(glob.glob(pattern))
+    if not input_files:
+        print(f"Error: No input files match {pattern}")
+        return False
+    if expected_dir is not None and output_dir is None:
+        print("Error: --expected needs --outdir so the reference files are not overwritten")
+        return False
+    if output_dir is not None:
+        os.makedirs(output_dir, exist_ok=True)
+
+    start = perf_counter()
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        results = list(pool.map(run_batch_file, input_files, repeat(output_dir), repeat(expected_dir), repeat(compact),
+                                 repeat(use_cache)))
+    elapsed = perf_counter() - start
+
+    width = max(len(input_file) for input_file in input_files)
+    print(f"{'file':<{width}}  result  {'time (ms)':>10}  detail")
+    for input_file, (passed, seconds, detail) in zip(input_files, results):
+        print(f"{input_file:<{width}}  {'PASS' if passed else 'FAIL':<6}  {seconds * 1000:>10.1f}  {detail}")
+    failed = sum(1 for passed, _, _ in results if not passed)
+    print(f"\n{len(results) - failed} passed, {failed} failed in {elapsed:.2f}s")
+    return failed == 0
+
+# The parsed workload of a quantum sweep or a comparison, (runfor, options, process
+# table). The pool initializer sets it in every worker; forked workers inherit the
+# parent's table rather than receiving a copy of it, and each run forks its own
+# per-run columns over it.
+SHARED_WORKLOAD = None
+
+def set_shared_workload(workload):
+    global SHARED_WORKLOAD
+    SHARED_WORKLOAD = workload
+
+def shared_workload_pool(workload, jobs=None):
+    """A process pool whose workers share `workload`, copy-on-write where fork is available."""
+    context = multiprocessing.get_context('fork') if 'fork' in multiprocessing.get_all_start_methods() else None
+    return ProcessPoolExecutor(max_workers=jobs, mp_context=context, initializer=set_shared_workload,
+                               initargs=(workload,))
+
+def run_sweep_quantum(quantum):
+    """Simulate Round-Robin with `quantum` on the shared sweep workload and return its averages."""
+    run_for, options, processes = SHARED_WORKLOAD
+    processes = processes.fork()
+    run_scheduler('rr', processes, run_for, quantum, NullTimeline(), options)
+    return processes.averages()
+
+def parse_quanta(spec):
+    """Quanta from 'first:last[:step]' (inclusive) or 'q1,q2,...'."""
+    try:
+        if ':' in spec:
+            first, last, *step = map(int, spec.split(':'))
+            if len(step) > 1 or step == [0]:
+                raise argparse.ArgumentTypeError(f"{spec!r} is not 'first:last[:step]' with a non-zero step")
+            step = step[0] if step else 1
+            quanta = list(range(first, last + (1 if step > 0 else -1), step))
+        else:
+            quanta = [int(quantum) for quantum in spec.split(',')]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"{spec!r} is not a list or range of whole numbers") from None
+    if not quanta:
+        raise argparse.ArgumentTypeError(f"{spec!r} gives no quantum")
+    if min(quanta) < 1:
+        raise argparse.ArgumentTypeError("every quantum must be at least 1")
+    return quanta
+
+def sweep_quanta(input_file, quanta, metric='turnaround', jobs=None, use_cache=True):
+    """Simulate Round-Robin on `input_file` once per quantum, in parallel from one parse.
+
+    The file's `use` and `quantum` lines are ignored; its `cpus` and
+    `contextswitch` lines apply. Prints a table of average wait, turnaround and
+    response per quantum and returns the quantum with the lowest average
+    `metric` (ties go to the smaller quantum), or None if no process finished
+    under any of them.
+    """
+    _, run_for, _, _, options, processes = load_workload(input_file, use_cache, check_use=False)
+    with shared_workload_pool((run_for, options, processes), jobs) as pool:
+        results = list(pool.map(run_sweep_quantum, quanta))
+
+    column = ('wait', 'turnaround', 'response').index(metric)
+    print(f"{'quantum':>7}  {'avg wait':>10}  {'avg turnaround':>14}  {'avg response':>12}  finished")
+    for quantum, (*means, finished) in zip(quanta, results):
+        cells = [f"{mean:.2f}" if mean is not None else '-' for mean in means]
+        print(f"{quantum:>7}  {cells[0]:>10}  {cells[1]:>14}  {cells[2]:>12}  {finished}/{len(processes)}")
+
+    scored = [(result[column], quantum) for quantum, result in zip(quanta, results) if result[3]]
+    if not scored:
+        print("\nNo process finished with any quantum")
+        return None
+    best_score, best = min(scored)
+    print(f"\nBest quantum: {best} (average {metric} {best_score:.2f})")
+    return best
+
+def parse_compare(spec):
+    """(algorithm, quantum or None) pairs from 'fcfs,sjf,rr:4,...'."""
+    policies = []
+    for entry in spec.split(','):
+        name, _, quantum = entry.strip().partition(':')
+        if name not in SCHEDULERS:
+            raise argparse.ArgumentTypeError(f"unknown algorithm {name!r} (choose from {', '.join(SCHEDULERS)})")
+        try:
+            quantum = int(quantum) if quantum else None
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"quantum of {entry.strip()!r} is not a number") from None
+        if quantum is not None and quantum < 1:
+            raise argparse.ArgumentTypeError(f"quantum of {entry.strip()!r} must be at least 1")
+        policies.append((name, quantum))
+    return policies
+
+def run_compared_policy(policy):
+    """Simulate one (algorithm, quantum) on the shared workload; return its RunSummary and usage."""
+    run_for, options, processes = SHARED_WORKLOAD
+    scheduling_algo, quantum = policy
+    processes = processes.fork()
+    summary = RunSummary()
+    timeline = EventBuffer([SummarySink(processes, summary)])
+    usage = run_scheduler(scheduling_algo, processes, run_for, quantum, timeline, options)
+    timeline.flush()
+    return summary, usage
+
+def compare_policies(input_file, policies, jobs=None, use_cache=True):
+    """Run every (algorithm, quantum) of `policies` on `input_file` in parallel from one parse.
+
+    The file's `use` line is ignored: only the listed policies are checked
+    against its settings. A policy without a quantum of its own uses the .in
+    file's. Prints the metrics side by side, one column per policy, and returns
+    the RunSummary of each policy (None for every policy if one cannot run).
+    """
+    _, run_for, _, file_quantum, options, processes = load_workload(input_file, use_cache, check_use=False)
+    labels = [f"{name}:{quantum}" if quantum is not None
+              else f"{name}:{file_quantum}" if file_quantum is not None and SCHEDULERS[name].needs_quantum
+              else name for name, quantum in policies]
+    policies = [(name, file_quantum if quantum is None else quantum) for name, quantum in policies]
+    for name, quantum in policies:
+        error = SCHEDULERS[name].check_parameters(quantum, options)
+        if error:
+            print(f"Error: {error}")
+            return None
+
+    with shared_workload_pool((run_for, options, processes), jobs) as pool:
+        results = list(pool.map(run_compared_policy, policies))
+
+    rows = []
+    for metric in RunSummary.METRICS:
+        rows.append((f"avg {metric}", [f"{summary.totals[metric] / summary.finished:.2f}" if summary.finished else '-'
+                                       for summary, _ in results]))
+        rows.append((f"p95 {metric}", [f"{summary.sketches[metric].quantile(0.95)}" if summary.finished else '-'
+                                       for summary, _ in results]))
+    rows.append(("throughput", [f"{summary.finished / run_for if run_for else 0:.4f}" for summary, _ in results]))
+    rows.append(("CPU utilization", [percent(*summary.utilization(run_for, usage)) for summary, usage in results]))
+    rows.append(("finished", [f"{summary.finished}/{len(processes)}" for summary, _ in results]))
+
+    width = max(10, *(len(label) for label in labels), *(len(cell) for _, cells in rows for cell in cells))
+    print(f"{'':<16}" + ''.join(f"  {label:>{width}}" for label in labels))
+    for title, cells in rows:
+        print(f"{title:<16}" + ''.join(f"  {cell:>{width}}" for cell in cells))
+    return [summary for summary, _ in results]
+
+def parse_emit(spec):
+    """The --emit formats named by `spec`, a comma-separated list of EMIT_FORMATS names."""
+    formats = tuple(name.strip() for name in spec.split(',') if name.strip())
+    unknown = [name for name in formats if name not in EMIT_FORMATS]
+    if unknown:
+        raise argparse.ArgumentTypeError(f"unknown format {unknown[0]!r} (choose from {', '.join(EMIT_FORMATS)})")
+    return formats
+
+# The modes other than simulating one file; at most one can be given
+MODES = ('--expand', '--batch', '--sweep-quantum', '--compare')
+
+# Where each option is used: None is simulating one file, the rest are MODES.
+# Anywhere else the option would be silently ignored, so main rejects it.
+OPTION_MODES = {
+    '--compact': (None, '--batch'),
+    '--no-cache': (None, '--batch', '--sweep-quantum', '--compare'),
+    '--jobs': ('--batch', '--sweep-quantum', '--compare'),
+    '--sweep-metric': ('--sweep-quantum',),
+    '--outdir': ('--batch',),
+    '--expected': ('--batch',),
+    '--summary': (None,),
+    '--emit': (None,),
+    '--metrics-only': (None,),
+    '--gantt': (None,),
+    '--profile': (None,),
+    '--checkpoint-every': (None,),
+    '--resume': (None,),
+}
+
+def misplaced_option(args):
+    """An error message if `args` combine modes or give an option the chosen mode ignores, else None."""
+    def given(flag):
+        value = getattr(args, flag[2:].replace('-', '_'))
+        return value is not None and value is not False and value != ()
+
+    modes = [mode for mode in MODES if given(mode)]
+    if len(modes) > 1:
+        return f"{modes[0]} and {modes[1]} cannot be combined"
+    mode = modes[0] if modes else None
+    for flag, used_by in OPTION_MODES.items():
+        if given(flag) and mode not in used_by:
+            places = [place or 'simulating one file' for place in used_by]
+            places[-2:] = [' and '.join(places[-2:])]
+            return f"{flag} only applies to {', '.join(places)}, not to {mode or 'simulating one file'}"
+    if given('--gantt-width') and not given('--gantt'):
+        return "--gantt-width only applies to --gantt"
+    return None
+
+def positive_int(text):
+    """A whole number of at least 1, as an argparse type."""
+    try:
+        value = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"{text!r} is not a whole number") from None
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"{text!r} must be at least 1")
+    return value
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog='scheduler-gpt.py',
+                                     description="Simulate the scheduler chosen by an .in file and write its .out file.")
+    parser.add_argument('input_file',
+                        help="the .in file to simulate (with --expand, a compact .out file; with --batch, a directory "
+                             "or glob of .in files)")
+    parser.add_argument('--compact', action='store_true',
+                        help="collapse each idle stretch into one 'Time a-b: Idle' line")
+    parser.add_argument('--expand', action='store_true',
+                        help="print a --compact .out file in the classic one-line-per-tick format")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="always parse the .in text instead of using or writing the compiled .inb cache")
+    parser.add_argument('--batch', action='store_true',
+                        help="simulate every matching .in file across a process pool")
+    parser.add_argument('--jobs', type=positive_int, metavar='N',
+                        help="worker processes for --batch, --sweep-quantum and --compare (default: one per CPU)")
+    parser.add_argument('--outdir',
+                        help="directory for the --batch .out files (default: next to each .in file)")
+    parser.add_argument('--expected',
+                        help="directory of reference .out files to compare --batch results against")
+    parser.add_argument('--summary', action='store_true',
+                        help="append a summary: mean and p50/p95/p99 wait, turnaround and response, throughput, CPU "
+                             "utilization and idle time")
+    parser.add_argument('--emit', type=parse_emit, default=(), metavar='FORMATS',
+                        help="also write these comma-separated outputs next to the .out file: jsonl (one JSON event "
+                             "per line), csv (per-process metrics), columnar (binary event columns, .cols)")
+    parser.add_argument('--metrics-only', action='store_true',
+                        help="leave the timeline out of the .out file and only write the per-process metrics")
+    parser.add_argument('--gantt', metavar='FILE',
+                        help="write the schedule as a Gantt chart (.svg or .html) or as run-length segments (.csv)")
+    parser.add_argument('--gantt-width', type=positive_int, metavar='PIXELS',
+                        help="width of the --gantt chart; longer runs are downsampled to one column per pixel "
+                             "(default: 1200)")
+    parser.add_argument('--profile', nargs='?', const='phases', choices=('phases', 'cprofile'),
+                        help="print how long each phase of the run took; '--profile cprofile' also prints the "
+                             "functions cProfile found most expensive")
+    parser.add_argument('--checkpoint-every', type=float, metavar='SECONDS',
+                        help="save the simulation state to a .ckpt file next to the .out file this often")
+    parser.add_argument('--resume', action='store_true',
+                        help="continue from the .ckpt file an interrupted run left (checkpointing every 60s unless "
+                             "--checkpoint-every is given)")
+    parser.add_argument('--sweep-quantum', type=parse_quanta, metavar='QUANTA',
+                        help="run Round-Robin on the workload once per quantum ('first:last[:step]' or 'q1,q2,...') "
+                             "in parallel and print average wait, turnaround and response for each")
+    parser.add_argument('--compare', type=parse_compare, metavar='POLICIES',
+                        help="run each comma-separated algorithm (e.g. 'fcfs,sjf,rr:4'; ':q' sets a quantum, else the "
+                             ".in file's is used) on the workload in parallel and print their metrics side by side")
+    parser.add_argument('--sweep-metric', choices=('wait', 'turnaround', 'response'),
+                        help="average that picks the best --sweep-quantum value (default: turnaround)")
+    return parser.parse_args(argv)
 
 def main():
     # Check if the input file is provided
@@ -298,29 +2216,54 @@ def main():
         print("Usage: scheduler-get.py <input file>")
         sys.exit(1)
 
-    input_file = sys.argv[1]
+    args = parse_args(sys.argv[1:])
+    input_file = args.input_file
+    if args.metrics_only and any(EMIT_FORMATS[name][2] is not None for name in args.emit):
+        sys.exit("--metrics-only records no events, so it cannot be combined with --emit jsonl or columnar")
 
-    # Parse the input file
-    process_count, run_for, scheduling_algo, quantum, processes = parse_input_file(input_file)
+    error = misplaced_option(args)
+    if error is not None:
+        sys.exit(error)
 
-    # JL: I added in this conditional block of code to decide which algorithm to run.
-    # Determine the name of the scheduling algorithm and run it
-    if scheduling_algo == 'fcfs':
-        scheduling_algo_name = "First-Come First-Served"
-        completed_processes = fcfs_scheduling(processes, run_for)
-    elif scheduling_algo == 'rr':
-        scheduling_algo_name = "Round-Robin"
-        completed_processes = round_robin_scheduling(processes, run_for, quantum)
-    elif scheduling_algo == 'sjf':
-        scheduling_algo_name = "preemptive Shortest Job First"
-        completed_processes =sjf_scheduling(processes, run_for)    
+    if args.expand:
+        expand_compact_output(input_file, sys.stdout)
+        return
+
+    if args.batch:
+        if not run_batch(input_file, args.outdir, args.expected, args.compact, args.jobs, not args.no_cache):
+            sys.exit(1)
+        return
+
+    if args.sweep_quantum:
+        sweep_quanta(input_file, args.sweep_quantum, args.sweep_metric or 'turnaround', args.jobs, not args.no_cache)
+        return
+
+    if args.compare:
+        if compare_policies(input_file, args.compare, args.jobs, not args.no_cache) is None:
+            sys.exit(1)
+        return
+
+    if args.profile and (args.checkpoint_every is not None or args.resume):
+        sys.exit("--profile cannot be combined with --checkpoint-every or --resume")
+    profiler = PhaseProfiler() if args.profile else None
+    sampler = cProfile.Profile() if args.profile == 'cprofile' else None
 
     # Create output file name by replacing the input file's extension with '.out'
-    output_file = os.path.splitext(input_file)[0] + '.out'
+    start = perf_counter()
+    if sampler is not None:
+        sampler.enable()
+    simulate_file(input_file, output_path(input_file), compact=args.compact, use_cache=not args.no_cache,
+                  checkpoint_interval=args.checkpoint_every, resume=args.resume, summary=args.summary,
+                  emit=args.emit, metrics_only=args.metrics_only, gantt=args.gantt, gantt_width=args.gantt_width or 1200,
+                  profiler=profiler)
+    if sampler is not None:
+        sampler.disable()
 
-    # Write the output to the file
-    # JL: I modified the call to bring it in line with the function definition.
-    print_to_output_file(process_count, scheduling_algo, run_for, quantum, processes, completed_processes, output_file)
+    if profiler is not None:
+        profiler.report(sys.stdout, perf_counter() - start)
+    if sampler is not None:
+        print()
+        pstats.Stats(sampler, stream=sys.stdout).sort_stats('cumulative').print_stats(25)
 
 if __name__ == '__main__':
     main()
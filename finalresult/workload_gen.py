@@ -0,0 +1,135 @@
+"""Synthetic workload generator for scale-testing the schedulers.
+
+Writes .in files in the usual processcount/runfor/use/quantum/process grammar,
+streaming the process lines so even 10^7 processes use constant memory. The same
+seed and options always produce the same file.
+
+Usage: python finalresult/workload_gen.py OUTPUT.in --processes N [options]
+"""
+
+import argparse
+import os
+import random
+
+ARRIVAL_MODELS = ('poisson', 'storm')
+BURST_MODELS = ('uniform', 'exponential', 'pareto')
+
+
+def arrival_times(rng, count, model='poisson', rate=0.1, storm_size=50, storm_spread=5):
+    """Yield `count` non-decreasing arrival times.
+
+    `poisson` spaces arrivals with exponential gaps at `rate` arrivals per time
+    unit. `storm` keeps the same long-run rate but delivers processes in storms
+    of about `storm_size` (geometric) arrivals spread over `storm_spread` time units.
+    """
+    clock = 0.0
+    if model == 'poisson':
+        for _ in range(count):
+            clock += rng.expovariate(rate)
+            yield int(clock)
+        return
+
+    last = 0
+    remaining = count
+    while remaining:
+        clock = max(clock + rng.expovariate(rate / storm_size), last)
+        size = min(remaining, 1 + int(rng.expovariate(1 / storm_size)))
+        offsets = sorted(rng.randint(0, storm_spread) for _ in range(size))
+        for offset in offsets:
+            last = int(clock) + offset
+            yield last
+        remaining -= size
+
+
+def burst_times(rng, count, model='exponential', mean=10, alpha=1.5, max_burst=None):
+    """Yield `count` positive burst times with the given `mean`.
+
+    `pareto` is heavy-tailed with shape `alpha` (> 1); `max_burst` caps any model.
+    """
+    cap = max_burst or float('inf')
+    if model == 'uniform':
+        draw = lambda: rng.randint(1, 2 * mean - 1)
+    elif model == 'exponential':
+        draw = lambda: round(rng.expovariate(1 / mean))
+    else:
+        scale = mean * (alpha - 1) / alpha
+        draw = lambda: int(scale * rng.paretovariate(alpha))
+    for _ in range(count):
+        yield int(min(max(1, draw()), cap))
+
+
+def write_workload(path, count, use='fcfs', quantum=None, run_for=None, seed=1, arrivals='poisson', rate=0.1,
+                   storm_size=50, storm_spread=5, bursts='exponential', burst_mean=10, pareto_alpha=1.5, max_burst=None,
+                   chunk_lines=65536):
+    """Write a `count`-process workload to `path` and return its `runfor`.
+
+    When `run_for` is None it is set to the time every process would have
+    finished on one CPU that is never idle while work is waiting, which is the
+    same for every work-conserving scheduler.
+    """
+    rng = random.Random(seed)
+    width = max(2, len(str(count - 1)))
+    makespan = 0
+    body_path = path + '.body'
+
+    with open(body_path, 'w') as body:
+        lines = []
+        pairs = zip(arrival_times(rng, count, arrivals, rate, storm_size, storm_spread),
+                    burst_times(rng, count, bursts, burst_mean, pareto_alpha, max_burst))
+        for index, (arrival, burst) in enumerate(pairs):
+            makespan = max(makespan, arrival) + burst
+            lines.append(f"process name P{index:0{width}d} arrival {arrival} burst {burst}\n")
+            if len(lines) >= chunk_lines:
+                body.write(''.join(lines))
+                lines.clear()
+        body.write(''.join(lines))
+        body.write("end\n")
+
+    if run_for is None:
+        run_for = makespan
+    try:
+        with open(path, 'w') as f, open(body_path) as body:
+            f.write(f"processcount {count}\n")
+            f.write(f"runfor {run_for}\n")
+            f.write(f"use {use}\n")
+            if quantum is not None:
+                f.write(f"quantum {quantum}\n")
+            while True:
+                block = body.read(1 << 20)
+                if not block:
+                    break
+                f.write(block)
+    finally:
+        os.remove(body_path)
+    return run_for
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('output', help="the .in file to write")
+    parser.add_argument('--processes', type=int, required=True, help="number of processes")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--use', default='fcfs', help="scheduling algorithm written to the file")
+    parser.add_argument('--quantum', type=int, help="quantum written to the file (default: 4 when --use rr or mlfq)")
+    parser.add_argument('--runfor', type=int, help="simulation length (default: when the last process would finish)")
+    parser.add_argument('--arrivals', choices=ARRIVAL_MODELS, default='poisson')
+    parser.add_argument('--rate', type=float, default=0.1, help="mean arrivals per time unit")
+    parser.add_argument('--storm-size', type=int, default=50, help="mean processes per storm for --arrivals storm")
+    parser.add_argument('--storm-spread', type=int, default=5, help="time units one storm is spread over")
+    parser.add_argument('--bursts', choices=BURST_MODELS, default='exponential')
+    parser.add_argument('--burst-mean', type=int, default=10)
+    parser.add_argument('--pareto-alpha', type=float, default=1.5, help="tail shape for --bursts pareto (must be > 1)")
+    parser.add_argument('--max-burst', type=int, help="cap on any single burst")
+    args = parser.parse_args()
+
+    if args.pareto_alpha <= 1:
+        parser.error("--pareto-alpha must be greater than 1")
+    quantum = args.quantum if args.quantum is not None or args.use not in ('rr', 'mlfq') else 4
+    run_for = write_workload(args.output, args.processes, args.use, quantum, args.runfor, args.seed, args.arrivals,
+                             args.rate, args.storm_size, args.storm_spread, args.bursts, args.burst_mean,
+                             args.pareto_alpha, args.max_burst)
+    print(f"Wrote {args.processes} processes to {args.output} (runfor {run_for})")
+
+
+if __name__ == '__main__':
+    main()